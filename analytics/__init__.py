@@ -0,0 +1,6 @@
+"""
+Offline analytics over saved conversations (columnar NumPy latency store).
+"""
+from .latency_store import LatencyStore
+
+__all__ = ['LatencyStore']
@@ -0,0 +1,3 @@
+from .latency_store import main
+
+main()
@@ -0,0 +1,290 @@
+# analytics/latency_store.py
+"""
+Columnar latency store over conversations/*.json.
+
+Ingestion is incremental: only conversation files not seen before are parsed,
+and their rows are appended to NumPy column files (one .npz per table):
+
+  calls     call, started_ts, ended_ts, n_messages
+  messages  call, ts, role (0=user 1=assistant), text_len, gap_ms
+  turns     call, turn, user_ts, response_ms, span_ms, n_chunks, answer_chars
+
+Timing comes from the timestamps ConversationSaver writes when a message is
+added: a user message is stamped after STT, an assistant chunk when it is
+handed to TTS. So response_ms = first agent chunk - user text, i.e. LLM +
+buffering time; span_ms = last agent chunk - user text.
+
+  python -m analytics ingest
+  python -m analytics query --since 7d
+  python -m analytics query --since 30d --metric span_ms --by day
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+STORE_DIR = "analytics_store"
+CONVERSATIONS_DIR = "conversations"
+
+ROLE_CODES = {"user": 0, "assistant": 1}
+
+SCHEMA = {
+    "calls": {
+        "call": np.int32,
+        "started_ts": np.float64,
+        "ended_ts": np.float64,
+        "n_messages": np.int32,
+    },
+    "messages": {
+        "call": np.int32,
+        "ts": np.float64,
+        "role": np.int8,
+        "text_len": np.int32,
+        "gap_ms": np.float32,
+    },
+    "turns": {
+        "call": np.int32,
+        "turn": np.int16,
+        "user_ts": np.float64,
+        "response_ms": np.float32,
+        "span_ms": np.float32,
+        "n_chunks": np.int16,
+        "answer_chars": np.int32,
+    },
+}
+
+
+def _ts(iso: str) -> float:
+    # ConversationSaver writes naive UTC isoformat()
+    return datetime.fromisoformat(iso).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _parse_since(spec: str) -> float:
+    """'7d', '12h', '30m' (relative) or an ISO date → epoch seconds."""
+    units = {"d": 86400, "h": 3600, "m": 60}
+    if spec and spec[-1] in units and spec[:-1].replace(".", "", 1).isdigit():
+        return time.time() - float(spec[:-1]) * units[spec[-1]]
+    return _ts(spec)
+
+
+class LatencyStore:
+    def __init__(self, store_dir: str = STORE_DIR):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+
+        self.tables = {name: self._load(name) for name in SCHEMA}
+        manifest_path = os.path.join(store_dir, "ingested.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.ingested = json.load(f)
+        else:
+            self.ingested = {}   # file name -> call index
+
+    # --------------------------------------------------
+    # storage
+    # --------------------------------------------------
+
+    def _load(self, name: str) -> dict:
+        path = os.path.join(self.store_dir, f"{name}.npz")
+        if os.path.exists(path):
+            with np.load(path) as data:
+                return {col: data[col] for col in SCHEMA[name]}
+        return {col: np.empty(0, dtype=dt) for col, dt in SCHEMA[name].items()}
+
+    def _save(self):
+        for name, cols in self.tables.items():
+            tmp = os.path.join(self.store_dir, f"{name}.tmp.npz")
+            np.savez(tmp, **cols)
+            os.replace(tmp, os.path.join(self.store_dir, f"{name}.npz"))
+
+        tmp = os.path.join(self.store_dir, "ingested.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.ingested, f)
+        os.replace(tmp, os.path.join(self.store_dir, "ingested.json"))
+
+    # --------------------------------------------------
+    # ingestion
+    # --------------------------------------------------
+
+    @staticmethod
+    def _rows(call: int, data: dict):
+        msgs = data.get("messages", [])
+        calls = [(call, _ts(data["started_at"]), _ts(data["ended_at"]), len(msgs))]
+
+        messages = []
+        turns = []
+        prev_ts = None
+        current = None   # [turn, user_ts, first_ts, last_ts, n_chunks, chars]
+
+        for m in msgs:
+            ts = _ts(m["timestamp"])
+            role = ROLE_CODES.get(m.get("role"), 1)
+            text_len = len(m.get("text") or "")
+            gap = (ts - prev_ts) * 1000 if prev_ts is not None else 0.0
+            messages.append((call, ts, role, text_len, gap))
+            prev_ts = ts
+
+            if role == 0:
+                if current is not None and current[2] is not None:
+                    turns.append(current)
+                current = [len(turns) + 1, ts, None, None, 0, 0]
+            elif current is not None:
+                if current[2] is None:
+                    current[2] = ts
+                current[3] = ts
+                current[4] += 1
+                current[5] += text_len
+
+        if current is not None and current[2] is not None:
+            turns.append(current)
+
+        turn_rows = [
+            (call, t, user_ts, (first - user_ts) * 1000, (last - user_ts) * 1000, n, chars)
+            for t, user_ts, first, last, n, chars in turns
+        ]
+        return calls, messages, turn_rows
+
+    def ingest(self, conversations_dir: str = CONVERSATIONS_DIR) -> int:
+        t0 = time.perf_counter()
+        new_rows = {name: [] for name in SCHEMA}
+        next_call = max(self.ingested.values(), default=-1) + 1
+        added = 0
+
+        for path in sorted(glob.glob(os.path.join(conversations_dir, "*.json"))):
+            name = os.path.basename(path)
+            if name in self.ingested:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                calls, messages, turns = self._rows(next_call, data)
+            except Exception as e:
+                print(f"[ANALYTICS] Skipping {name}: {e}")
+                continue
+
+            new_rows["calls"] += calls
+            new_rows["messages"] += messages
+            new_rows["turns"] += turns
+            self.ingested[name] = next_call
+            next_call += 1
+            added += 1
+
+        if added:
+            for name, rows in new_rows.items():
+                if not rows:
+                    continue
+                columns = list(zip(*rows))
+                for (col, dt), values in zip(SCHEMA[name].items(), columns):
+                    self.tables[name][col] = np.concatenate(
+                        [self.tables[name][col], np.asarray(values, dtype=dt)]
+                    )
+            self._save()
+
+        dt_ms = int((time.perf_counter() - t0) * 1000)
+        print(
+            f"[ANALYTICS] Ingested {added} new conversations in {dt_ms} ms "
+            f"(store: {len(self.tables['calls']['call'])} calls, "
+            f"{len(self.tables['turns']['call'])} turns)"
+        )
+        return added
+
+    # --------------------------------------------------
+    # queries
+    # --------------------------------------------------
+
+    def query(self, metric: str = "response_ms", since: float = None, until: float = None, by: str = None):
+        """
+        Percentiles of a turns column over [since, until) (epoch seconds).
+        by='day' → one row per UTC day. Returns a list of dicts.
+        """
+        turns = self.tables["turns"]
+        if metric not in turns:
+            raise ValueError(f"[ANALYTICS] Unknown turn metric '{metric}'")
+
+        ts = turns["user_ts"]
+        mask = np.ones(len(ts), dtype=bool)
+        if since is not None:
+            mask &= ts >= since
+        if until is not None:
+            mask &= ts < until
+
+        values = turns[metric][mask].astype(np.float64)
+
+        if by is None:
+            return [self._summary("all", values)]
+        if by != "day":
+            raise ValueError("[ANALYTICS] --by supports only 'day'")
+
+        days = (ts[mask] // 86400).astype(np.int64)
+        order = np.argsort(days, kind="stable")
+        days, values = days[order], values[order]
+        uniq, starts = np.unique(days, return_index=True)
+        groups = np.split(values, starts[1:])
+        return [
+            self._summary(datetime.fromtimestamp(int(d) * 86400, timezone.utc).strftime("%Y-%m-%d"), g)
+            for d, g in zip(uniq, groups)
+        ]
+
+    @staticmethod
+    def _summary(label: str, values: np.ndarray) -> dict:
+        if len(values) == 0:
+            return {"label": label, "count": 0}
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            "label": label,
+            "count": int(len(values)),
+            "mean": float(values.mean()),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+        }
+
+
+def main():
+    p = argparse.ArgumentParser(description="Conversation latency analytics")
+    p.add_argument("--store", default=STORE_DIR)
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    ing = sub.add_parser("ingest", help="load new conversations into the store")
+    ing.add_argument("--conversations", default=CONVERSATIONS_DIR)
+
+    q = sub.add_parser("query", help="turn latency percentiles")
+    q.add_argument("--metric", default="response_ms", choices=["response_ms", "span_ms", "n_chunks", "answer_chars"])
+    q.add_argument("--since", default=None, help="e.g. 7d, 12h or 2026-10-01")
+    q.add_argument("--until", default=None)
+    q.add_argument("--by", default=None, choices=["day"])
+    q.add_argument("--ingest", action="store_true", help="ingest new conversations first")
+    q.add_argument("--conversations", default=CONVERSATIONS_DIR)
+
+    args = p.parse_args()
+    store = LatencyStore(args.store)
+
+    if args.cmd == "ingest" or getattr(args, "ingest", False):
+        store.ingest(args.conversations)
+    if args.cmd == "ingest":
+        return
+
+    t0 = time.perf_counter()
+    rows = store.query(
+        metric=args.metric,
+        since=_parse_since(args.since) if args.since else None,
+        until=_parse_since(args.until) if args.until else None,
+        by=args.by,
+    )
+    dt_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"[ANALYTICS] {args.metric}  ({dt_ms:.1f} ms)")
+    print(f"{'':<12}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for r in rows:
+        if not r["count"]:
+            print(f"{r['label']:<12}{0:>8}")
+            continue
+        print(
+            f"{r['label']:<12}{r['count']:>8}{r['mean']:>10.0f}"
+            f"{r['p50']:>10.0f}{r['p95']:>10.0f}{r['p99']:>10.0f}"
+        )
@@ -0,0 +1,163 @@
+# audio_input.py
+"""
+Persistent microphone input – opened once per call.
+
+The PortAudio callback only copies each block into a preallocated ring buffer
+(no Python-level VAD work there), so capture keeps running while STT / TTS
+hold the GIL on other threads. The turn loop pulls frames from the ring and
+feeds the incremental VAD (recorder_vad.UtteranceDetector).
+
+InputEngine mimics the stream interface record_until_silence() expects
+(read(n) -> (frames, overflowed) + context manager), so:
+
+    engine = InputEngine()
+    audio = engine.record_utterance()     # per turn
+    engine.close()                        # end of call
+"""
+
+import threading
+import time
+import numpy as np
+import sounddevice as sd
+
+from recorder_vad import (
+    SAMPLE_RATE,
+    FRAME_SIZE,
+    CUTOFF_RESUME_SECONDS,
+    check_cutoff,
+    get_default_state,
+    record_until_silence,
+)
+from ring_buffer import SPSCRing
+
+# read() gives up after this long without device audio and returns silence,
+# so a stalled / unplugged device cannot hang the turn loop
+READ_TIMEOUT_SECONDS = 1.0
+
+
+class InputEngine:
+    def __init__(self, capacity_seconds: float = 60.0, device=None):
+        self._ring = SPSCRing(int(capacity_seconds * SAMPLE_RATE))
+        self._data_ready = threading.Event()
+        self.listening = False
+
+        # ring full while listening → callback had to drop a block
+        self.overflows = 0
+        # reported by PortAudio
+        self.device_overflows = 0
+        self.device_underflows = 0
+        # read() timed out waiting for the device and returned silence
+        self.read_timeouts = 0
+        self._stalled = False
+
+        # ring position where the last utterance was endpointed; the audio
+        # after it stays in the ring until the next turn → cutoff check
+        self._endpoint_pos = None
+        self._vad_state = None
+
+        self._stream = sd.InputStream(
+            channels=1,
+            samplerate=SAMPLE_RATE,
+            blocksize=FRAME_SIZE,
+            dtype="float32",
+            device=device,
+            callback=self._callback,
+        )
+        self._stream.start()
+        print(f"[AUDIO-IN] Input stream open @ {SAMPLE_RATE} Hz")
+
+    # --------------------------------------------------
+    # producer (PortAudio thread)
+    # --------------------------------------------------
+
+    def _callback(self, indata, frames, time_info, status):
+        if status.input_overflow:
+            self.device_overflows += 1
+        if status.input_underflow:
+            self.device_underflows += 1
+
+        if not self._ring.push(indata[:, 0]):
+            # outside a turn nobody reads (agent speaking) – that is not a loss
+            if self.listening:
+                self.overflows += 1
+            return
+        self._data_ready.set()
+
+    # --------------------------------------------------
+    # consumer (turn loop)
+    # --------------------------------------------------
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # stays open for the whole call
+        return False
+
+    def read(self, frames: int, timeout: float = READ_TIMEOUT_SECONDS):
+        """
+        Next `frames` samples. If the device delivers nothing for `timeout`
+        seconds, returns silence instead of blocking, so record_until_silence()
+        still reaches its end-of-utterance / max_wait checks. While the device
+        stays stalled, silence is returned at real-time pace.
+        """
+        if self._stalled:
+            timeout = frames / SAMPLE_RATE
+        deadline = time.perf_counter() + timeout
+        while self._ring.available() < frames:
+            self._data_ready.clear()
+            if self._ring.available() >= frames:
+                break
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                if not self._stalled:
+                    self._stalled = True
+                    self.read_timeouts += 1
+                    print(f"[AUDIO-IN] No device audio for {timeout:.1f}s → feeding silence")
+                return np.zeros((frames, 1), dtype=np.float32), False
+            self._data_ready.wait(timeout=remaining)
+
+        self._stalled = False
+        out = np.empty(frames, dtype=np.float32)
+        self._ring.pop_into(out)
+        return out.reshape(-1, 1), False
+
+    def discard_pending(self):
+        """Drops audio captured while the agent was speaking (no barge-in)."""
+        self._ring.skip_all()
+
+    def _check_cutoff(self):
+        """Feeds the audio captured right after the last endpoint to check_cutoff()."""
+        if self._endpoint_pos is None:
+            return
+        n = min(int(CUTOFF_RESUME_SECONDS * SAMPLE_RATE), self._ring.write_pos - self._endpoint_pos)
+        if n > 0:
+            after = np.empty(n, dtype=np.float32)
+            self._ring.copy(self._endpoint_pos, after)
+            check_cutoff(self._vad_state, after, debug=True)
+        self._endpoint_pos = None
+
+    def record_utterance(self, state=None, **kwargs):
+        self._check_cutoff()
+        self.discard_pending()
+        self._vad_state = state or get_default_state()
+        self.listening = True
+        try:
+            result = record_until_silence(stream=self, state=self._vad_state, **kwargs)
+        finally:
+            self.listening = False
+        self._endpoint_pos = self._ring.read_pos
+        return result
+
+    def report(self) -> str:
+        return (
+            f"[AUDIO-IN] overflows={self.overflows} "
+            f"device_overflows={self.device_overflows} "
+            f"device_underflows={self.device_underflows} "
+            f"read_timeouts={self.read_timeouts}"
+        )
+
+    def close(self):
+        self._check_cutoff()
+        self._stream.stop()
+        self._stream.close()
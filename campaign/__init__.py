@@ -0,0 +1,8 @@
+"""
+Outbound dialing campaigns – scheduler on top of a telephony backend.
+"""
+from .scheduler import CampaignScheduler, CallResult
+from .sim_backend import SimulatedTelephony
+from .pipeline_backend import PipelineTelephony
+
+__all__ = ['CampaignScheduler', 'CallResult', 'SimulatedTelephony', 'PipelineTelephony']
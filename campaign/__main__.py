@@ -0,0 +1,118 @@
+# campaign/__main__.py
+"""
+Run a dialing campaign.
+
+  python -m campaign --numbers numbers.txt --simulate --concurrency 8 --cps 2
+  python -m campaign --numbers numbers.txt --simulate --sweep 1,2,4,8,16
+  python -m campaign --numbers numbers.txt --pipeline sim_calls/ --sweep 1,2,4,8
+
+--sweep runs the same simulated campaign at several concurrency levels and
+prints turn latency per level, to find where the box starts to degrade.
+--simulate alone only exercises the scheduler (CPU spin loop per turn);
+--pipeline plays call scripts through the real VAD / STT / turn loop.
+"""
+
+import argparse
+import os
+import tempfile
+
+from .scheduler import CampaignScheduler, fmt_ms
+from .pipeline_backend import PipelineTelephony
+from .sim_backend import SimulatedTelephony
+
+
+def _load_numbers(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def _make_backend(args):
+    if args.pipeline:
+        return PipelineTelephony(
+            args.pipeline,
+            llm_ttft=args.llm_ttft,
+            llm_chunk=args.llm_chunk,
+            tts_latency=args.tts_latency,
+            speed=args.speed,
+            seed=args.seed,
+        )
+    if not args.simulate:
+        # no real carrier integration in this repo yet
+        raise SystemExit("[CAMPAIGN] No telephony backend configured – use --simulate or --pipeline")
+    return SimulatedTelephony(
+        turn_cpu_ms=args.turn_cpu_ms,
+        speed=args.speed,
+        seed=args.seed,
+    )
+
+
+def _sweep(args, numbers):
+    backend = _make_backend(args)
+    rows = []
+
+    for level in [int(x) for x in args.sweep.split(",") if x.strip()]:
+        print(f"\n========== SWEEP concurrency={level} ==========")
+        with tempfile.TemporaryDirectory() as tmp:
+            scheduler = CampaignScheduler(
+                numbers,
+                backend,
+                progress_path=os.path.join(tmp, "progress.json"),
+                max_concurrent=level,
+                calls_per_second=args.cps,
+                max_attempts=1,
+                debug=False,
+            )
+            rows.append((level, scheduler.run(report_every_s=args.report_every)))
+
+    print("\n[CAMPAIGN] Sweep results")
+    print(f"[CAMPAIGN] {backend.label}")
+    print("concurrency  completed/min  occupancy  turn_p50  turn_p95")
+    for level, m in rows:
+        print(
+            f"{level:>11}  {m['completed_per_min']:>13}  {m['occupancy']:>9.0%}  "
+            f"{fmt_ms(m['turn_p50_ms']):>8}  {fmt_ms(m['turn_p95_ms']):>8}"
+        )
+
+
+def main():
+    p = argparse.ArgumentParser(description="Outbound call campaign runner")
+    p.add_argument("--numbers", required=True, help="text file, one number per line")
+    p.add_argument("--progress", default="campaign_progress.json")
+    p.add_argument("--concurrency", type=int, default=4)
+    p.add_argument("--cps", type=float, default=1.0, help="new dials per second")
+    p.add_argument("--max-attempts", type=int, default=3)
+    p.add_argument("--retry-base", type=float, default=60.0, help="first retry delay (s)")
+    p.add_argument("--retry-max", type=float, default=900.0)
+    p.add_argument("--report-every", type=float, default=10.0)
+    p.add_argument("--simulate", action="store_true", help="use the simulated telephony backend")
+    p.add_argument("--turn-cpu-ms", type=float, default=120.0, help="spin backend: CPU work per turn")
+    p.add_argument("--pipeline", default="", help="dir of call scripts → run the real turn loop per call")
+    p.add_argument("--llm-ttft", default="400:1200", help="pipeline: LLM first-token latency p50:p95 ms")
+    p.add_argument("--llm-chunk", default="60:150", help="pipeline: LLM inter-chunk latency p50:p95 ms")
+    p.add_argument("--tts-latency", default="350:900", help="pipeline: TTS synthesis latency p50:p95 ms")
+    p.add_argument("--speed", type=float, default=1.0, help="time compression of simulated waits")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--sweep", default="", help="comma-separated concurrency levels")
+    args = p.parse_args()
+
+    numbers = _load_numbers(args.numbers)
+
+    if args.sweep:
+        _sweep(args, numbers)
+        return
+
+    scheduler = CampaignScheduler(
+        numbers,
+        _make_backend(args),
+        progress_path=args.progress,
+        max_concurrent=args.concurrency,
+        calls_per_second=args.cps,
+        max_attempts=args.max_attempts,
+        retry_base_seconds=args.retry_base,
+        retry_max_seconds=args.retry_max,
+    )
+    scheduler.run(report_every_s=args.report_every)
+
+
+if __name__ == "__main__":
+    main()
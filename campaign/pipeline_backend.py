@@ -0,0 +1,65 @@
+# campaign/pipeline_backend.py
+"""
+Simulated telephony backend that runs the real call pipeline.
+
+Every answered call plays a recorded call script (a directory of caller turn
+WAVs, see sim/) through main.run_call(): the real VAD and STTManager, with
+StubLLM and a stub TTS for the remote services (sim.call_simulator).
+
+Turn latency = STT + time from the transcript to the first answer audio,
+i.e. how long the caller waits after the endpoint. It grows once concurrent
+calls contend for the CPU / the shared STT model.
+"""
+
+from .sim_backend import SimulatedDialer
+
+
+class PipelineTelephony(SimulatedDialer):
+    label = "pipeline backend – VAD + STT + run_call turn loop, stub LLM / TTS"
+
+    def __init__(
+        self,
+        scripts_dir: str,
+        llm_ttft: str = "400:1200",
+        llm_chunk: str = "60:150",
+        tts_latency: str = "350:900",
+        answer_rate: float = 0.6,
+        busy_rate: float = 0.15,
+        fail_rate: float = 0.02,
+        ring_seconds=(2.0, 8.0),
+        speed: float = 1.0,
+        seed=None,
+    ):
+        super().__init__(answer_rate, busy_rate, fail_rate, ring_seconds, speed, seed)
+
+        # heavy imports (Whisper, main) only when this backend is used
+        from sim.call_simulator import load_scripts
+        from sim.latency import LatencyDist
+        from stt.stt_manager import STTManager
+
+        self.scripts = load_scripts(scripts_dir)
+        if not self.scripts:
+            raise SystemExit(f"[PIPE-TEL] No WAV turns found under {scripts_dir}")
+
+        self.llm_ttft = LatencyDist.parse(llm_ttft)
+        self.llm_chunk = LatencyDist.parse(llm_chunk)
+        self.tts_latency = LatencyDist.parse(tts_latency)
+
+        # one shared STT, as on a real box serving several calls
+        self.stt = STTManager()
+        print(f"[PIPE-TEL] {len(self.scripts)} call scripts, speed={self.speed}x")
+
+    def _talk(self) -> list:
+        from llm.llm_stub import StubLLM
+        from sim.call_simulator import make_stub_tts, simulate_call
+
+        llm = StubLLM(self.llm_ttft, self.llm_chunk)
+        tts = make_stub_tts(self.tts_latency, self.speed)
+        script = self._rng.choice(self.scripts)
+
+        timings = simulate_call(script, self.stt, llm, tts, self.speed)
+        return [
+            t["stt_ms"] + t["first_audio_ms"]
+            for t in timings
+            if t.get("first_audio_ms") is not None
+        ]
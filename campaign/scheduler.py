@@ -0,0 +1,353 @@
+# campaign/scheduler.py
+"""
+Campaign scheduler – dials a list of numbers through a telephony backend.
+
+- bounded concurrency (max simultaneous calls)
+- calls-per-second rate limit on new dials
+- retry with exponential backoff for no-answer / busy
+- progress persisted (resumable after crash / Ctrl+C): a JSON snapshot plus
+  an append-only journal of status changes (<progress>.log), replayed on load
+  and compacted into the snapshot at start-up and shutdown
+- pending numbers in a heap keyed by next_attempt_at (no per-dial scans)
+- throughput + occupancy metrics
+
+A backend is any object with `dial(number) -> CallResult`.
+`dial()` blocks for the whole call (ring + conversation).
+"""
+
+import heapq
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+# outcomes returned by backends
+COMPLETED = "completed"
+NO_ANSWER = "no_answer"
+BUSY = "busy"
+FAILED = "failed"
+
+RETRYABLE_OUTCOMES = (NO_ANSWER, BUSY)
+
+# per-number status in the progress file
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+GAVE_UP = "gave_up"
+
+
+@dataclass
+class CallResult:
+    outcome: str
+    duration_s: float = 0.0
+    turn_latencies_ms: list = field(default_factory=list)
+
+
+def percentile(values, p: float):
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+class RateLimiter:
+    """Spaces dials at least 1/rate seconds apart (thread-safe)."""
+
+    def __init__(self, calls_per_second: float):
+        self.interval = 1.0 / calls_per_second if calls_per_second > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+
+class CampaignMetrics:
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self.started = time.monotonic()
+        self.outcomes = {}
+        self.dials = 0
+        self.busy_seconds = 0.0
+        self.active = 0
+        self.peak_active = 0
+        self.turn_latencies_ms = []
+        self._lock = threading.Lock()
+
+    def call_started(self):
+        with self._lock:
+            self.dials += 1
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+    def call_finished(self, result: CallResult, wall_s: float):
+        with self._lock:
+            self.active -= 1
+            self.busy_seconds += wall_s
+            self.outcomes[result.outcome] = self.outcomes.get(result.outcome, 0) + 1
+            self.turn_latencies_ms.extend(result.turn_latencies_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-6)
+            lat = list(self.turn_latencies_ms)
+            return {
+                "elapsed_s": round(elapsed, 2),
+                "dials": self.dials,
+                "outcomes": dict(self.outcomes),
+                "dials_per_min": round(self.dials / elapsed * 60, 2),
+                "completed_per_min": round(self.outcomes.get(COMPLETED, 0) / elapsed * 60, 2),
+                # fraction of available call slots that were busy
+                "occupancy": round(self.busy_seconds / (elapsed * self.max_concurrent), 3),
+                "peak_active": self.peak_active,
+                "turns": len(lat),
+                "turn_p50_ms": percentile(lat, 50),
+                "turn_p95_ms": percentile(lat, 95),
+            }
+
+
+class CampaignScheduler:
+    def __init__(
+        self,
+        numbers,
+        backend,
+        progress_path: str = "campaign_progress.json",
+        max_concurrent: int = 4,
+        calls_per_second: float = 1.0,
+        max_attempts: int = 3,
+        retry_base_seconds: float = 60.0,
+        retry_max_seconds: float = 900.0,
+        debug: bool = True,
+    ):
+        self.backend = backend
+        self.progress_path = progress_path
+        self.max_concurrent = max_concurrent
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.debug = debug
+
+        self.rate_limiter = RateLimiter(calls_per_second)
+        self.metrics = CampaignMetrics(max_concurrent)
+
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(max_concurrent)
+        self._stop = threading.Event()
+
+        self.journal_path = progress_path + ".log"
+        self.progress = self._load_progress()
+        added = 0
+        for number in numbers:
+            number = str(number).strip()
+            if number and number not in self.progress:
+                self.progress[number] = {
+                    "status": PENDING,
+                    "attempts": 0,
+                    "next_attempt_at": 0.0,
+                    "last_outcome": None,
+                }
+                added += 1
+
+        # status counts and the pending heap are kept up to date incrementally
+        self._counts = {}
+        self._pending = []      # (next_attempt_at, seq, number)
+        self._seq = 0
+        for number, entry in self.progress.items():
+            self._counts[entry["status"]] = self._counts.get(entry["status"], 0) + 1
+            if entry["status"] == PENDING:
+                self._push_pending(number, entry)
+
+        self._save_progress()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+        if self.debug:
+            print(
+                f"[CAMPAIGN] {len(self.progress)} numbers "
+                f"({added} new, {self._count(DONE) + self._count(GAVE_UP)} already finished)"
+            )
+
+    # --------------------------------------------------
+    # progress persistence
+    # --------------------------------------------------
+
+    def _load_progress(self) -> dict:
+        if not os.path.exists(self.progress_path):
+            return {}
+
+        with open(self.progress_path, "r", encoding="utf-8") as f:
+            progress = json.load(f).get("numbers", {})
+
+        # status changes since the last snapshot (a torn last line = crash mid-write)
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        continue
+                    progress[change.pop("number")] = change
+
+        # calls that were live when the process died never reported back
+        for entry in progress.values():
+            if entry["status"] == IN_PROGRESS:
+                entry["status"] = PENDING
+
+        return progress
+
+    def _save_progress(self):
+        """Full snapshot + empty journal. Only at start-up / shutdown (O(numbers))."""
+        tmp = self.progress_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"numbers": self.progress}, f, ensure_ascii=False)
+        os.replace(tmp, self.progress_path)
+        # the snapshot now contains every journaled change
+        open(self.journal_path, "w", encoding="utf-8").close()
+
+    def _log_change(self, number: str, entry: dict):
+        # caller holds self._lock; one short line per status change
+        self._journal.write(json.dumps(dict(entry, number=number), ensure_ascii=False) + "\n")
+        self._journal.flush()
+
+    def _set_status(self, entry: dict, status: str):
+        self._counts[entry["status"]] -= 1
+        self._counts[status] = self._counts.get(status, 0) + 1
+        entry["status"] = status
+
+    def _push_pending(self, number: str, entry: dict):
+        self._seq += 1
+        heapq.heappush(self._pending, (entry["next_attempt_at"], self._seq, number))
+
+    def _count(self, status: str) -> int:
+        return self._counts.get(status, 0)
+
+    # --------------------------------------------------
+    # scheduling
+    # --------------------------------------------------
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.retry_base_seconds * (2 ** (attempts - 1)), self.retry_max_seconds)
+        return delay * random.uniform(0.8, 1.2)
+
+    def _next_due(self):
+        """Returns (number, None) for a due number, (None, wait_s) otherwise."""
+        now = time.time()
+        with self._lock:
+            if not self._pending:
+                return None, None
+            due_at, _, number = self._pending[0]
+            if due_at > now:
+                return None, due_at - now
+
+            heapq.heappop(self._pending)
+            entry = self.progress[number]
+            self._set_status(entry, IN_PROGRESS)
+            entry["attempts"] += 1
+            self._log_change(number, entry)
+            return number, None
+
+    def _finish(self, number: str, result: CallResult):
+        with self._lock:
+            entry = self.progress[number]
+            entry["last_outcome"] = result.outcome
+
+            if result.outcome in RETRYABLE_OUTCOMES and entry["attempts"] < self.max_attempts:
+                self._set_status(entry, PENDING)
+                entry["next_attempt_at"] = time.time() + self._backoff(entry["attempts"])
+                self._push_pending(number, entry)
+            elif result.outcome == COMPLETED:
+                self._set_status(entry, DONE)
+            else:
+                self._set_status(entry, GAVE_UP)
+
+            self._log_change(number, entry)
+
+    def _run_call(self, number: str):
+        t0 = time.monotonic()
+        self.metrics.call_started()
+        try:
+            result = self.backend.dial(number)
+        except Exception as e:
+            print(f"[CAMPAIGN] ERROR dialing {number}: {e}")
+            result = CallResult(outcome=FAILED)
+        finally:
+            self._slots.release()
+
+        wall_s = time.monotonic() - t0
+        self.metrics.call_finished(result, wall_s)
+        self._finish(number, result)
+
+        if self.debug:
+            print(f"[CAMPAIGN] {number} → {result.outcome} ({wall_s:.1f}s)")
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, report_every_s: float = 10.0) -> dict:
+        workers = []
+        last_report = time.monotonic()
+
+        try:
+            while not self._stop.is_set():
+                if time.monotonic() - last_report >= report_every_s:
+                    self.print_report()
+                    last_report = time.monotonic()
+
+                # wait for a free call slot first, so a due number is not
+                # marked in-progress while it sits waiting
+                if not self._slots.acquire(timeout=0.2):
+                    continue
+
+                number, wait = self._next_due()
+                if number is None:
+                    self._slots.release()
+                    workers = [w for w in workers if w.is_alive()]
+                    if wait is None and not workers:
+                        break  # nothing pending, nothing live → campaign done
+                    time.sleep(min(wait if wait is not None else 0.2, 0.5))
+                    continue
+
+                self.rate_limiter.acquire()
+                w = threading.Thread(target=self._run_call, args=(number,), daemon=True)
+                w.start()
+                workers.append(w)
+
+        except KeyboardInterrupt:
+            print("\n[CAMPAIGN] Ctrl+C → waiting for live calls to finish")
+
+        for w in workers:
+            w.join()
+
+        with self._lock:
+            self._journal.close()
+            self._save_progress()
+
+        self.print_report()
+        return self.metrics.snapshot()
+
+    def print_report(self):
+        m = self.metrics.snapshot()
+        with self._lock:
+            remaining = self._count(PENDING) + self._count(IN_PROGRESS)
+        print(
+            "[CAMPAIGN] "
+            f"elapsed={m['elapsed_s']}s dials={m['dials']} remaining={remaining} "
+            f"outcomes={m['outcomes']} "
+            f"dials/min={m['dials_per_min']} completed/min={m['completed_per_min']} "
+            f"occupancy={m['occupancy']:.0%} peak_active={m['peak_active']} "
+            f"turn_p50={fmt_ms(m['turn_p50_ms'])} turn_p95={fmt_ms(m['turn_p95_ms'])}"
+        )
+
+
+def fmt_ms(v) -> str:
+    return "-" if v is None else f"{int(v)}ms"
@@ -0,0 +1,127 @@
+# campaign/sim_backend.py
+"""
+Simulated telephony backend – a smoke test for the campaign scheduler itself
+(concurrency, rate limit, retries, progress file). It says nothing about the
+call pipeline; campaign/pipeline_backend.py runs the real turn loop.
+
+Every answered call runs a number of turns. Each turn is:
+- caller speaking  → wall-clock wait (no CPU)
+- agent turn       → fixed amount of pure-Python CPU work (stands in for
+                     VAD/STT/JSON work; holds the GIL like the real loop)
+
+Turn latency is measured in wall-clock time, so it grows once the box runs
+more concurrent calls than it can actually serve.
+"""
+
+import random
+import time
+
+from .scheduler import CallResult, COMPLETED, NO_ANSWER, BUSY, FAILED
+
+
+def _spin(iterations: int) -> int:
+    acc = 0
+    for i in range(iterations):
+        acc = (acc + i * i) % 1000003
+    return acc
+
+
+class SimulatedDialer:
+    """
+    Ring / answer / busy / fail outcomes shared by the simulated backends.
+    Subclasses implement _talk() -> per-turn latencies (ms) of an answered call.
+    """
+
+    # printed with --sweep results
+    label = "simulated"
+
+    def __init__(
+        self,
+        answer_rate: float = 0.6,
+        busy_rate: float = 0.15,
+        fail_rate: float = 0.02,
+        ring_seconds=(2.0, 8.0),
+        speed: float = 1.0,
+        seed=None,
+    ):
+        self.answer_rate = answer_rate
+        self.busy_rate = busy_rate
+        self.fail_rate = fail_rate
+        self.ring_seconds = ring_seconds
+        self.speed = max(speed, 1e-3)
+        self._rng = random.Random(seed)
+
+    def _sleep(self, seconds: float):
+        time.sleep(seconds / self.speed)
+
+    def _talk(self) -> list:
+        raise NotImplementedError
+
+    def dial(self, number: str) -> CallResult:
+        t0 = time.perf_counter()
+        self._sleep(self._rng.uniform(*self.ring_seconds))
+
+        roll = self._rng.random()
+        if roll < self.fail_rate:
+            return CallResult(FAILED, time.perf_counter() - t0)
+        roll -= self.fail_rate
+        if roll < self.busy_rate:
+            return CallResult(BUSY, time.perf_counter() - t0)
+        roll -= self.busy_rate
+        if roll >= self.answer_rate:
+            return CallResult(NO_ANSWER, time.perf_counter() - t0)
+
+        latencies = self._talk()
+        return CallResult(COMPLETED, time.perf_counter() - t0, latencies)
+
+
+class SimulatedTelephony(SimulatedDialer):
+    label = (
+        "spin backend – scheduler smoke test only: turn latency is a CPU spin "
+        "loop, not the VAD/STT/LLM/TTS pipeline (use --pipeline for that)"
+    )
+
+    def __init__(
+        self,
+        answer_rate: float = 0.6,
+        busy_rate: float = 0.15,
+        fail_rate: float = 0.02,
+        ring_seconds=(2.0, 8.0),
+        turns=(3, 8),
+        user_speech_seconds=(1.0, 4.0),
+        turn_cpu_ms: float = 120.0,
+        speed: float = 1.0,
+        seed=None,
+    ):
+        super().__init__(answer_rate, busy_rate, fail_rate, ring_seconds, speed, seed)
+        self.turns = turns
+        self.user_speech_seconds = user_speech_seconds
+        self.turn_cpu_ms = turn_cpu_ms
+
+        self._iters_per_ms = self._calibrate()
+        print(
+            f"[SIM-TEL] turn_cpu_ms={turn_cpu_ms} speed={self.speed}x "
+            f"(calibrated {self._iters_per_ms} iters/ms)"
+        )
+
+    @staticmethod
+    def _calibrate() -> int:
+        n = 200_000
+        t0 = time.perf_counter()
+        _spin(n)
+        dt_ms = max((time.perf_counter() - t0) * 1000, 1e-3)
+        return max(int(n / dt_ms), 1)
+
+    def _talk(self) -> list:
+        latencies = []
+        # CPU work is not time-compressed: it is what we are measuring
+        iterations = int(self.turn_cpu_ms * self._iters_per_ms)
+
+        for _ in range(self._rng.randint(*self.turns)):
+            self._sleep(self._rng.uniform(*self.user_speech_seconds))
+
+            t_turn = time.perf_counter()
+            _spin(iterations)
+            latencies.append((time.perf_counter() - t_turn) * 1000)
+
+        return latencies
@@ -9,6 +9,17 @@ STT_ENGINE = "huggingface"
 
 WHISPER_MODEL_PATH = "stt/whisper-large-v3-turbo-ct2"
 
+# Tiered STT (enable with STT_TIERED=true):
+# short utterances go to a small model first and are escalated to
+# WHISPER_MODEL_PATH only when the small model is not confident.
+WHISPER_SMALL_MODEL_PATH = "stt/whisper-small-ct2"
+TIERED_MAX_SECONDS = 2.5          # longer speech spans go straight to the large model
+TIERED_MIN_AVG_LOGPROB = -0.55    # escalate below this
+TIERED_MAX_NO_SPEECH_PROB = 0.45  # escalate above this
+
+# Per-host decode settings written by `python -m stt.autotune`, loaded by HFSTT
+STT_PROFILE_PATH = "stt/stt_profile.json"
+
 # Recording parameters
 SAMPLE_RATE = 16000
 FRAME_DURATION = 0.03  # 30 ms
@@ -9,7 +9,10 @@ class ConversationSaver:
         os.makedirs(self.output_dir, exist_ok=True)
 
         self.messages = []
-        self.started_at = datetime.utcnow().isoformat()
+        started = datetime.utcnow()
+        self.started_at = started.isoformat()
+        # file stem shared with per-turn profiles written next to the JSON
+        self.call_id = started.strftime('%Y%m%d_%H%M%S')
 
     # ✅ Public API used by main.py
     def add_user(self, text: str):
@@ -35,7 +38,7 @@ class ConversationSaver:
             print("[ConversationSaver] No messages to save")
             return
 
-        filename = f"conversation_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
+        filename = f"conversation_{self.call_id}.json"
         path = os.path.join(self.output_dir, filename)
 
         data = {
@@ -0,0 +1,225 @@
+# llm/backends.py
+"""
+Pluggable LLM backends + time-to-first-token (TTFT) failover.
+
+Backends are registered by name and created lazily (llm_gemma refuses to import
+without GEMMA_LLM_URL, llm_openai needs OPENAI_API_KEY):
+
+  gemma   – llm_gemma.ask_gemma_stream
+  openai  – llm_openai.ask_openai_stream
+  stub    – llm_stub.ask_stub_stream (local, no network)
+
+LLMRouter.ask_stream() starts the primary backend; if it has not produced a
+first chunk within the TTFT budget (or fails), the secondary is started too and
+whichever streams first wins. Nothing may hang a live call past hard_timeout_s.
+"""
+
+import queue
+import threading
+import time
+
+_FACTORIES = {}
+_BACKENDS = {}
+
+
+def register_backend(name: str):
+    """Decorator: registers a factory returning an ask_stream(user_text) callable."""
+    def deco(factory):
+        _FACTORIES[name] = factory
+        return factory
+    return deco
+
+
+def get_backend(name: str):
+    if name not in _BACKENDS:
+        if name not in _FACTORIES:
+            raise ValueError(f"[LLM] Unknown backend '{name}' (known: {', '.join(_FACTORIES)})")
+        _BACKENDS[name] = _FACTORIES[name]()
+    return _BACKENDS[name]
+
+
+@register_backend("gemma")
+def _gemma():
+    from llm.llm_gemma import ask_gemma_stream
+    return ask_gemma_stream
+
+
+@register_backend("openai")
+def _openai():
+    from llm.llm_openai import ask_openai_stream
+    return ask_openai_stream
+
+
+@register_backend("stub")
+def _stub():
+    from llm.llm_stub import ask_stub_stream
+    return ask_stub_stream
+
+
+class BackendStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def _entry(self, name):
+        return self.stats.setdefault(name, {
+            "started": 0, "won": 0, "lost": 0, "errors": 0,
+            "ttft_ms": [], "words_per_s": [],
+        })
+
+    def record(self, name, **kw):
+        with self._lock:
+            e = self._entry(name)
+            for key, value in kw.items():
+                if isinstance(e[key], list):
+                    e[key].append(value)
+                else:
+                    e[key] += value
+
+    def report(self) -> str:
+        lines = ["[LLM] Backend report:"]
+        with self._lock:
+            for name, e in self.stats.items():
+                ttft = sorted(e["ttft_ms"])
+                wps = e["words_per_s"]
+                lines.append(
+                    f"[LLM]   {name}: started={e['started']} won={e['won']} lost={e['lost']} "
+                    f"errors={e['errors']} "
+                    f"ttft_p50={ttft[len(ttft) // 2] if ttft else '-'} ms "
+                    f"ttft_max={ttft[-1] if ttft else '-'} ms "
+                    f"words/s={sum(wps) / len(wps) if wps else 0:.1f} (whole run)"
+                )
+        return "\n".join(lines)
+
+
+class LLMRouter:
+    def __init__(
+        self,
+        primary: str,
+        secondary: str = None,
+        ttft_budget_s: float = 1.5,
+        hard_timeout_s: float = 15.0,
+        fallback_text: str = "סליחה, לא שמעתי טוב. אפשר לחזור על זה?",
+    ):
+        self.primary = primary
+        self.secondary = secondary or None
+        self.ttft_budget_s = ttft_budget_s
+        self.hard_timeout_s = hard_timeout_s
+        self.fallback_text = fallback_text
+        self.stats = BackendStats()
+
+        # create eagerly so config errors surface at call start, not mid-turn
+        get_backend(self.primary)
+        if self.secondary:
+            get_backend(self.secondary)
+
+        print(
+            f"[LLM] Backend: {self.primary}"
+            + (f" (failover → {self.secondary} after {int(ttft_budget_s * 1000)} ms TTFT)" if self.secondary else "")
+        )
+
+    def _run(self, name, user_text, out: queue.Queue, cancel: threading.Event):
+        t0 = time.perf_counter()
+        t_first = None
+        words = 0
+        self.stats.record(name, started=1)
+        try:
+            for chunk in get_backend(name)(user_text):
+                if cancel.is_set():
+                    return
+                if t_first is None:
+                    t_first = time.perf_counter()
+                    self.stats.record(name, ttft_ms=int((t_first - t0) * 1000))
+                words += len(chunk.split())
+                out.put((name, "chunk", chunk))
+
+            # over the whole run, not from the first chunk: non-streaming
+            # backends (gemma) return the full answer, then yield it instantly
+            dt = time.perf_counter() - t0
+            if t_first is not None and dt > 0:
+                self.stats.record(name, words_per_s=words / dt)
+            out.put((name, "done", None))
+
+        except Exception as e:
+            self.stats.record(name, errors=1)
+            print(f"[LLM] {name} failed: {e}")
+            out.put((name, "error", e))
+
+    def _start(self, name, user_text, out):
+        cancel = threading.Event()
+        threading.Thread(
+            target=self._run, args=(name, user_text, out, cancel),
+            name=f"llm-{name}", daemon=True,
+        ).start()
+        return cancel
+
+    def ask_stream(self, user_text: str):
+        out = queue.Queue()
+        t0 = time.perf_counter()
+        cancels = {self.primary: self._start(self.primary, user_text, out)}
+        finished = set()
+        winner = None
+
+        # -------- race for the first chunk --------
+        while winner is None:
+            elapsed = time.perf_counter() - t0
+            if elapsed >= self.hard_timeout_s:
+                break
+
+            secondary_pending = self.secondary and self.secondary not in cancels
+            deadline = self.ttft_budget_s if secondary_pending else self.hard_timeout_s
+            try:
+                name, kind, payload = out.get(timeout=max(deadline - elapsed, 0.001))
+            except queue.Empty:
+                if secondary_pending:
+                    print(f"[LLM] {self.primary} no first token after {int(self.ttft_budget_s * 1000)} ms → starting {self.secondary}")
+                    cancels[self.secondary] = self._start(self.secondary, user_text, out)
+                continue
+
+            if kind == "chunk":
+                winner = name
+                first_chunk = payload
+                break
+
+            # done without output, or error → that backend is out of the race
+            finished.add(name)
+            if secondary_pending:
+                print(f"[LLM] {self.primary} gave nothing → starting {self.secondary}")
+                cancels[self.secondary] = self._start(self.secondary, user_text, out)
+            elif finished >= set(cancels):
+                break
+
+        if winner is None:
+            print(f"[LLM] No backend produced a token within {self.hard_timeout_s:.0f}s → fallback line")
+            for cancel in cancels.values():
+                cancel.set()
+            if self.fallback_text:
+                yield self.fallback_text
+            return
+
+        self.stats.record(winner, won=1)
+        for name, cancel in cancels.items():
+            if name != winner:
+                cancel.set()
+                if name not in finished:
+                    self.stats.record(name, lost=1)
+
+        yield first_chunk
+
+        # -------- stream the winner --------
+        while True:
+            try:
+                name, kind, payload = out.get(timeout=self.hard_timeout_s)
+            except queue.Empty:
+                print(f"[LLM] {winner} stalled for {self.hard_timeout_s:.0f}s → cutting answer short")
+                cancels[winner].set()
+                return
+            if name != winner:
+                continue
+            if kind == "chunk":
+                yield payload
+            else:
+                return
+
+    def print_report(self):
+        print(self.stats.report())
@@ -12,6 +12,12 @@ GEMMA_URL = os.getenv("GEMMA_LLM_URL", "").strip()
 if not GEMMA_URL:
     raise RuntimeError("GEMMA_LLM_URL is not set")
 
+# (connect, read) – a live call must never wait 120 s; see llm/backends.py
+GEMMA_TIMEOUT = (
+    float(os.getenv("GEMMA_CONNECT_TIMEOUT", "3")),
+    float(os.getenv("GEMMA_READ_TIMEOUT", "20")),
+)
+
 SYSTEM_PROMPT = """
 את סוכנת מכירות טלפונית בשם דנה, עובדת בחברת "דניאל סושיאל".
 
@@ -38,7 +44,7 @@ def ask_gemma_stream(user_text: str):
     r = requests.post(
         GEMMA_URL,
         json=payload,
-        timeout=120,
+        timeout=GEMMA_TIMEOUT,
     )
     r.raise_for_status()
     dt = int((time.perf_counter() - t0) * 1000)
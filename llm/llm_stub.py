@@ -0,0 +1,59 @@
+# llm/llm_stub.py
+"""
+Local stand-in LLM – no network.
+Streams canned Hebrew replies with configurable latency (call simulator,
+offline testing).
+"""
+
+import random
+import time
+
+REPLIES = [
+    "בשמחה. אנחנו בונים לעסקים קמפיינים ברשתות החברתיות. מה התחום של העסק שלך?",
+    "הבנתי. כמה לקוחות חדשים בחודש היית רוצה להביא?",
+    "מעולה. אפשר לקבוע שיחה קצרה עם מנהל הלקוחות שלנו, מתי נוח לך?",
+    "סגור. אני שולחת לך הודעה עם הפרטים. יש עוד משהו שאפשר לעזור בו?",
+]
+
+
+class StubLLM:
+    def __init__(self, first_token_latency=None, chunk_latency=None, replies=None, seed=None):
+        """
+        first_token_latency / chunk_latency: callables returning seconds
+        (e.g. sim.latency.LatencyDist). None = no delay.
+        """
+        self.first_token_latency = first_token_latency
+        self.chunk_latency = chunk_latency
+        self.replies = replies or REPLIES
+        self._rng = random.Random(seed)
+
+    def ask_stream(self, user_text: str):
+        if self.first_token_latency is not None:
+            time.sleep(self.first_token_latency())
+
+        full_text = self._rng.choice(self.replies)
+
+        # same chunking as llm_gemma
+        buffer = ""
+        first = True
+        for token in full_text.split(" "):
+            buffer += token + " "
+
+            if len(buffer) >= 60 or buffer.endswith(("?", "!", ".", ",")):
+                if not first and self.chunk_latency is not None:
+                    time.sleep(self.chunk_latency())
+                first = False
+                yield buffer.strip()
+                buffer = ""
+
+        if buffer.strip():
+            if self.chunk_latency is not None:
+                time.sleep(self.chunk_latency())
+            yield buffer.strip()
+
+
+_default_stub = StubLLM(first_token_latency=lambda: 0.3)
+
+
+def ask_stub_stream(user_text: str):
+    yield from _default_stub.ask_stream(user_text)
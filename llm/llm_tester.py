@@ -1,4 +1,4 @@
-from llm_openai import ask_openai
+from llm_openai import ask_openai_stream
 
-reply = ask_openai("היי מה נשמע? תענה בעברית בבקשה.")
+reply = " ".join(ask_openai_stream("היי מה נשמע? תענה בעברית בבקשה."))
 print("AI:", reply)
@@ -7,13 +7,26 @@ load_dotenv()
 
 RUNPOD = os.getenv("RUNPOD", "false").lower() == "true"
 
+# LLM backends: gemma | openai | stub (see llm/backends.py)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemma")
+LLM_FALLBACK_BACKEND = os.getenv("LLM_FALLBACK_BACKEND", "openai")
+LLM_TTFT_BUDGET_MS = int(os.getenv("LLM_TTFT_BUDGET_MS", "1500"))
+
+FILLERS = os.getenv("FILLERS", "true").lower() == "true"
+
+# one InputStream for the whole call (callback → ring buffer) vs. one per turn
+PERSISTENT_INPUT = os.getenv("PERSISTENT_INPUT", "true").lower() == "true"
+
 if not RUNPOD:
-    from recorder_vad import record_until_silence
+    from recorder_vad import record_until_silence, endpoint_report
+    from audio_input import InputEngine
 
 from stt.stt_manager import STTManager
-from llm.llm_gemma import ask_gemma_stream
-from tts.tts_openai import speak_text, wait_until_all_spoken
+from tts.tts_openai import get_default_pipeline, synthesize_openai
+from tts.fillers import FillerBank, FillerMasker
 from conversation_saver import ConversationSaver
+from llm.backends import LLMRouter
+from turn_profiler import TurnProfiler
 
 
 EXIT_PHRASES = [
@@ -54,129 +67,224 @@ def should_flush(buffer: str, last_emit: float) -> bool:
     return False
 
 
-def main():
-    print("========== AgenTeam Phone Agent ==========")
-    print(f"[DEBUG] RUNPOD={RUNPOD}")
-    print("[DEBUG] MODE = LOCAL SPEAKERS (NO BARGE-IN)")
-    print("[DEBUG] MODE = STREAMING LLM → SMART TTS BUFFER")
+def _make_listener(engine=None):
+    def listen(stt):
+        if RUNPOD:
+            return "input.wav"
+        print("🎤 Listening for user (AI is silent)...")
+        partial = stt.quick_transcribe if stt.small else None
+        if engine is not None:
+            return engine.record_utterance(partial_transcriber=partial)
+        return record_until_silence(partial_transcriber=partial)
+    return listen
 
-    saver = ConversationSaver()
-    stt = STTManager()
 
-    print("\n📞 Call started\n")
+def run_call(
+    saver, stt, listen, ask_stream, tts,
+    log=print, max_turns=None, profiler=None, filler=None,
+):
+    """
+    Runs one call: greeting, then turns until an exit phrase, hang-up or max_turns.
+
+    listen(stt)           -> audio input for stt.transcribe(), or None = caller hung up
+    ask_stream(user_text) -> iterator of text chunks
+    tts                   -> TTSPipeline (speak_text / wait_until_all_spoken)
+    profiler              -> optional TurnProfiler (caller must end_turn() on exit)
+    filler                -> optional FillerMasker (plays fillers on a slow first chunk)
+
+    Returns a list of per-turn timings (ms).
+    """
+    timings = []
+
+    log("\n📞 Call started\n")
 
     # ---------- Greeting ----------
     greeting = "היי, שלום. מדברת דנה מדניאל סושיאל. איך אפשר לעזור?"
     saver.add_ai(greeting)
 
-    print("[DEBUG] AI speaking greeting (mic ignored)")
+    log("[DEBUG] AI speaking greeting (mic ignored)")
     t0 = time.perf_counter()
-    speak_text(greeting)
-    wait_until_all_spoken()
+    tts.speak_text(greeting)
+    tts.wait_until_all_spoken()
     time.sleep(0.05)
-    print(f"[TIME] Greeting TTS (gen+play): {ms(t0)} ms")
+    log(f"[TIME] Greeting TTS (gen+play): {ms(t0)} ms")
 
     turn = 0
 
-    try:
-        while True:
-            turn += 1
-            turn_start = time.perf_counter()
-            print(f"\n========== TURN {turn} ==========")
-
-            # ---------- USER LISTENING ----------
-            if RUNPOD:
-                audio_input = "input.wav"
-                record_ms = 0
-            else:
-                print("🎤 Listening for user (AI is silent)...")
-                t_rec = time.perf_counter()
-                audio_input = record_until_silence()
-                record_ms = ms(t_rec)
-                print(f"[TIME] Record (VAD): {record_ms} ms")
-
-            # ---------- STT ----------
-            t_stt = time.perf_counter()
-            user_text = (stt.transcribe(audio_input) or "").strip()
-            stt_ms = ms(t_stt)
-
-            print(f"[DEBUG] STT: '{user_text}'")
-            print(f"[TIME] STT: {stt_ms} ms")
-
-            if not user_text:
-                print("[DEBUG] No user speech detected")
-                print(f"[TIME] Turn total: {ms(turn_start)} ms")
+    while max_turns is None or turn < max_turns:
+        turn += 1
+        if profiler is not None:
+            profiler.start_turn(turn)
+        turn_start = time.perf_counter()
+        log(f"\n========== TURN {turn} ==========")
+
+        # ---------- USER LISTENING ----------
+        t_rec = time.perf_counter()
+        audio_input = listen(stt)
+        record_ms = ms(t_rec)
+
+        if audio_input is None:
+            log("[DEBUG] Caller hung up")
+            break
+
+        log(f"[TIME] Record (VAD): {record_ms} ms")
+
+        if isinstance(audio_input, tuple) and audio_input[0] is None:
+            log("[DEBUG] No user speech detected")
+            continue
+
+        # ---------- STT ----------
+        t_stt = time.perf_counter()
+        user_text = (stt.transcribe(audio_input) or "").strip()
+        stt_ms = ms(t_stt)
+
+        log(f"[DEBUG] STT: '{user_text}'")
+        log(f"[TIME] STT: {stt_ms} ms")
+
+        if not user_text:
+            log("[DEBUG] No user speech detected")
+            log(f"[TIME] Turn total: {ms(turn_start)} ms")
+            continue
+
+        saver.add_user(user_text)
+        log(f"👤 User: {user_text}")
+
+        # ---------- EXIT ----------
+        if should_exit(user_text):
+            farewell = "מעולה, תודה רבה. יום טוב ולהתראות."
+            saver.add_ai(farewell)
+
+            log("[DEBUG] AI farewell")
+            t_tts = time.perf_counter()
+            tts.speak_text(farewell)
+            tts.wait_until_all_spoken()
+            time.sleep(0.2)
+
+            log(f"[TIME] TTS (gen+play): {ms(t_tts)} ms")
+            log(f"[TIME] Turn total: {ms(turn_start)} ms")
+            break
+
+        # ---------- LLM STREAMING ----------
+        log("[DEBUG] LLM streaming started")
+        t_llm = time.perf_counter()
+        tts.mark_turn_start()
+        first_chunk_time = None
+
+        speech_buffer = ""
+        last_emit = time.time()
+
+        chunks = ask_stream(user_text)
+        if filler is not None:
+            chunks = filler.wrap(chunks, tts)
+
+        for chunk in chunks:
+            chunk = chunk.strip()
+            if not chunk:
                 continue
 
-            saver.add_user(user_text)
-            print(f"👤 User: {user_text}")
-
-            # ---------- EXIT ----------
-            if should_exit(user_text):
-                farewell = "מעולה, תודה רבה. יום טוב ולהתראות."
-                saver.add_ai(farewell)
-
-                print("[DEBUG] AI farewell")
-                t_tts = time.perf_counter()
-                speak_text(farewell)
-                wait_until_all_spoken()
-                time.sleep(0.2)
-
-                print(f"[TIME] TTS (gen+play): {ms(t_tts)} ms")
-                print(f"[TIME] Turn total: {ms(turn_start)} ms")
-                break
-
-            # ---------- LLM STREAMING ----------
-            print("[DEBUG] LLM streaming started")
-            t_llm = time.perf_counter()
-            first_chunk_time = None
-
-            speech_buffer = ""
-            last_emit = time.time()
-
-            for chunk in ask_gemma_stream(user_text):
-                chunk = chunk.strip()
-                if not chunk:
-                    continue
-
-                if first_chunk_time is None:
-                    first_chunk_time = ms(t_llm)
-                    print(f"[TIME] LLM first chunk: {first_chunk_time} ms")
-
-                print(f"[STREAM] AI chunk: {chunk}")
-                speech_buffer += " " + chunk
-
-                if should_flush(speech_buffer, last_emit):
-                    text_to_speak = speech_buffer.strip()
-                    saver.add_ai(text_to_speak)
-                    speak_text(text_to_speak)
-                    speech_buffer = ""
-                    last_emit = time.time()
-
-            # flush remainder
-            if speech_buffer.strip():
-                saver.add_ai(speech_buffer.strip())
-                speak_text(speech_buffer.strip())
-
-            llm_total_ms = ms(t_llm)
-            print(f"[TIME] LLM total streaming: {llm_total_ms} ms")
-
-            # ---------- WAIT FOR SPEECH ----------
-            wait_until_all_spoken()
-            time.sleep(0.02)
-
-            # ---------- TURN SUMMARY ----------
-            print(
-                "[TIME] Turn breakdown (ms): "
-                f"record={record_ms} stt={stt_ms} "
-                f"llm_first_chunk={first_chunk_time} llm_total={llm_total_ms} "
-                f"total={ms(turn_start)}"
-            )
+            if first_chunk_time is None:
+                first_chunk_time = ms(t_llm)
+                log(f"[TIME] LLM first chunk: {first_chunk_time} ms")
+
+            log(f"[STREAM] AI chunk: {chunk}")
+            speech_buffer += " " + chunk
+
+            if should_flush(speech_buffer, last_emit):
+                text_to_speak = speech_buffer.strip()
+                saver.add_ai(text_to_speak)
+                tts.speak_text(text_to_speak)
+                speech_buffer = ""
+                last_emit = time.time()
+
+        # flush remainder
+        if speech_buffer.strip():
+            saver.add_ai(speech_buffer.strip())
+            tts.speak_text(speech_buffer.strip())
+
+        llm_total_ms = ms(t_llm)
+        log(f"[TIME] LLM total streaming: {llm_total_ms} ms")
+
+        # ---------- WAIT FOR SPEECH ----------
+        t_wait = time.perf_counter()
+        tts.wait_until_all_spoken()
+        speak_wait_ms = ms(t_wait)
+        time.sleep(0.02)
+
+        # first_audio = the real answer; a filler before it is reported apart
+        first_audio_ms = None
+        if tts.first_audio_at is not None:
+            first_audio_ms = int((tts.first_audio_at - t_llm) * 1000)
+        first_filler_ms = None
+        if tts.first_filler_at is not None:
+            first_filler_ms = int((tts.first_filler_at - t_llm) * 1000)
+
+        # ---------- TURN SUMMARY ----------
+        total_ms = ms(turn_start)
+        log(
+            "[TIME] Turn breakdown (ms): "
+            f"record={record_ms} stt={stt_ms} "
+            f"llm_first_chunk={first_chunk_time} llm_total={llm_total_ms} "
+            f"first_audio={first_audio_ms} first_filler={first_filler_ms} total={total_ms}"
+        )
+        timings.append({
+            "record_ms": record_ms,
+            "stt_ms": stt_ms,
+            "llm_first_chunk_ms": first_chunk_time,
+            "llm_total_ms": llm_total_ms,
+            "first_audio_ms": first_audio_ms,
+            "first_filler_ms": first_filler_ms,
+            "speak_wait_ms": speak_wait_ms,
+            "total_ms": total_ms,
+        })
+
+    if profiler is not None:
+        profiler.end_turn()
+
+    return timings
+
+
+def main():
+    print("========== AgenTeam Phone Agent ==========")
+    print(f"[DEBUG] RUNPOD={RUNPOD}")
+    print("[DEBUG] MODE = LOCAL SPEAKERS (NO BARGE-IN)")
+    print("[DEBUG] MODE = STREAMING LLM → SMART TTS BUFFER")
+
+    saver = ConversationSaver()
+    stt = STTManager()
+    llm = LLMRouter(
+        LLM_BACKEND,
+        LLM_FALLBACK_BACKEND,
+        ttft_budget_s=LLM_TTFT_BUDGET_MS / 1000.0,
+    )
+    profiler = TurnProfiler(saver.output_dir, saver.call_id)
+    filler = FillerMasker(FillerBank(synthesize_openai)) if FILLERS else None
+    engine = InputEngine() if (PERSISTENT_INPUT and not RUNPOD) else None
+
+    try:
+        run_call(
+            saver, stt, _make_listener(engine), llm.ask_stream, get_default_pipeline(),
+            profiler=profiler,
+            filler=filler,
+        )
 
     except KeyboardInterrupt:
         print("\n📴 Ctrl+C")
 
     finally:
+        profiler.end_turn()
+        stt.print_routing_report()
+        llm.print_report()
+        if filler is not None:
+            print(filler.report())
+        if engine is not None:
+            engine.close()   # also checks the last turn for a cutoff
+            print(engine.report())
+        if not RUNPOD:
+            print(endpoint_report())
+        output = get_default_pipeline().output
+        if output is not None:
+            print(output.report())
+            output.close()
         saver.save()
         print("📁 Conversation saved")
         print("📞 Call ended")
@@ -14,7 +14,58 @@ MIN_START_SPEECH_SECONDS = 0.18   # must speak this long before we accept speech
 MIN_SPEECH_DURATION = 0.50        # lock speech only after real phrase
 END_SILENCE_SECONDS = 0.70        # silence to end utterance (IMPORTANT)
 
-GLOBAL_NOISE_FLOOR = None
+# -------- Adaptive endpointing --------
+# END_SILENCE_SECONDS becomes the baseline; the endpointer shortens it when the
+# phrase clearly ends (falling energy / pitch, complete partial transcript) and
+# extends it when the caller stops mid-sentence.
+ADAPTIVE_ENDPOINTING = True
+MIN_END_SILENCE_SECONDS = 0.30
+MAX_END_SILENCE_SECONDS = 1.10
+NOISE_TRACK_ALPHA = 0.004         # EMA of the noise floor before speech (~5 s time constant at 50 frames/s)
+CUTOFF_RESUME_SECONDS = 0.60      # speech right after an early endpoint = caller was cut off
+CUTOFF_MIN_SPEECH_SECONDS = 0.10  # ...if it lasts at least this long (not a click)
+
+PITCH_MIN_HZ = 75
+PITCH_MAX_HZ = 400
+
+# Hebrew short answers / closings that are complete on their own
+COMPLETE_SHORT_ANSWERS = ("כן", "לא", "בסדר", "תודה", "אוקיי", "נכון", "ממש לא", "בטח")
+# last words that mean the caller is still mid-sentence. Attached prefixes
+# (ו / ש / ל...) are never separate words after split(), so they are not here.
+CONTINUATION_ENDINGS = (
+    "אבל", "כי", "או", "אז", "עם", "של", "את", "גם", "על", "אם", "לגבי", "כמו", "בגלל", "עד",
+)
+
+
+
+class VADState:
+    """
+    Per-call VAD state carried across turns: calibrated / tracked noise floor,
+    whether the last turn was endpointed early, and endpointing stats.
+    One per call, so parallel (simulated) calls do not leak into each other.
+    """
+
+    def __init__(self):
+        self.noise_floor = None
+        self.last_turn_ended_early = False
+        self.last_end_th = None
+        self.stats = {
+            "turns": 0,
+            "saved_ms": 0,
+            "shortened_turns": 0,
+            "extended_turns": 0,
+            "cutoff_checks": 0,
+            "cutoffs": 0,
+            "input_overflows": 0,
+        }
+
+
+# used when the caller does not pass its own state (single live call)
+_default_state = VADState()
+
+
+def get_default_state() -> VADState:
+    return _default_state
 
 
 def _frame_energy(frame: np.ndarray) -> float:
@@ -22,6 +73,147 @@ def _frame_energy(frame: np.ndarray) -> float:
     return float(np.sqrt(np.mean(mono ** 2)) + 1e-9)
 
 
+def _frame_pitch(frame: np.ndarray, samplerate: int = SAMPLE_RATE):
+    """Autocorrelation pitch estimate in Hz, or None if the frame is unvoiced."""
+    x = frame.reshape(-1).astype(np.float32)
+    x = x - x.mean()
+    ac = np.correlate(x, x, mode="full")[len(x) - 1:]
+    if ac[0] <= 0:
+        return None
+
+    lo = int(samplerate / PITCH_MAX_HZ)
+    hi = min(int(samplerate / PITCH_MIN_HZ), len(ac) - 1)
+    if hi <= lo:
+        return None
+
+    lag = lo + int(np.argmax(ac[lo:hi]))
+    if ac[lag] / ac[0] < 0.45:
+        return None
+    return samplerate / lag
+
+
+class Endpointer:
+    """
+    Decides how much trailing silence ends the current utterance.
+
+    Fed every speech frame; asked for the required silence when a pause
+    starts and (optionally) again with a partial transcript.
+    """
+
+    def __init__(self, base_seconds: float = END_SILENCE_SECONDS):
+        self.base_frames = int(base_seconds / FRAME_DURATION)
+        self.min_frames = int(MIN_END_SILENCE_SECONDS / FRAME_DURATION)
+        self.max_frames = int(MAX_END_SILENCE_SECONDS / FRAME_DURATION)
+
+        self.energies = []
+        self.pitches = []
+        self.reason = "base"
+
+    def observe_speech(self, frame: np.ndarray, energy: float):
+        self.energies.append(energy)
+        pitch = _frame_pitch(frame)
+        if pitch is not None:
+            self.pitches.append(pitch)
+
+    def on_pause(self) -> int:
+        """Required silence frames, from the prosody of the phrase so far."""
+        if not ADAPTIVE_ENDPOINTING or len(self.energies) < 10:
+            self.reason = "base"
+            return self.base_frames
+
+        phrase_energy = float(np.median(self.energies))
+        tail_energy = float(np.mean(self.energies[-5:]))
+        energy_falling = tail_energy < 0.6 * phrase_energy
+        energy_high = tail_energy >= phrase_energy
+
+        pitch_falling = False
+        if len(self.pitches) >= 10:
+            pitch_falling = np.median(self.pitches[-4:]) < 0.9 * np.median(self.pitches[:-4])
+
+        if energy_falling and pitch_falling:
+            self.reason = "energy+pitch falling"
+            return max(self.min_frames, int(self.base_frames * 0.6))
+        if energy_falling or pitch_falling:
+            self.reason = "energy falling" if energy_falling else "pitch falling"
+            return max(self.min_frames, int(self.base_frames * 0.8))
+        if energy_high:
+            # cut off at full volume → most likely a mid-sentence breath
+            self.reason = "mid-sentence"
+            return min(self.max_frames, int(self.base_frames * 1.4))
+
+        self.reason = "base"
+        return self.base_frames
+
+    def on_partial(self, text: str, current_frames: int) -> int:
+        """Refines the requirement from a partial transcript of the phrase."""
+        text = (text or "").strip()
+        if not ADAPTIVE_ENDPOINTING or not text:
+            return current_frames
+
+        core = text.rstrip("?!.,… ")
+        words = core.split()
+
+        # continuation first: Whisper ends almost every segment with a period,
+        # so "אני רוצה לשאול על." must still count as mid-sentence
+        if text.endswith((",", "...", "…")) or (words and words[-1] in CONTINUATION_ENDINGS):
+            self.reason = "transcript continues"
+            return self.max_frames
+        # a trailing period alone proves nothing – only a question or a short answer
+        if text.endswith("?") or core in COMPLETE_SHORT_ANSWERS:
+            self.reason = "complete transcript"
+            return self.min_frames
+        self.reason = "transcript inconclusive"
+        return current_frames
+
+
+def endpoint_report(state: VADState = None) -> str:
+    s = (state or _default_state).stats
+    turns = max(s["turns"], 1)
+    return (
+        f"[VAD] Endpointing: turns={s['turns']} "
+        f"saved_total={s['saved_ms']} ms avg_saved={s['saved_ms'] // turns} ms/turn "
+        f"shortened={s['shortened_turns']} extended={s['extended_turns']} "
+        f"cutoffs={s['cutoffs']}/{s['cutoff_checks']} early endpoints checked "
+        f"input_overflows={s['input_overflows']}"
+    )
+
+
+def check_cutoff(state: VADState, audio: np.ndarray, debug: bool = False) -> bool:
+    """
+    Was the last turn cut off? `audio` is what the microphone captured right
+    after an early endpoint (up to CUTOFF_RESUME_SECONDS of it). If the caller
+    kept talking in that window – energy above the turn's end threshold for
+    CUTOFF_MIN_SPEECH_SECONDS – the endpoint was too early.
+
+    Callers that keep capturing after the endpoint (InputEngine ring,
+    simulator file) feed this; per-turn InputStreams cannot, and the
+    report shows how many early endpoints were actually checked.
+    """
+    if not state.last_turn_ended_early or state.last_end_th is None:
+        return False
+    state.last_turn_ended_early = False   # check each early endpoint once
+
+    audio = np.asarray(audio, dtype=np.float32).reshape(-1)[: int(CUTOFF_RESUME_SECONDS * SAMPLE_RATE)]
+    needed = max(int(CUTOFF_MIN_SPEECH_SECONDS / FRAME_DURATION), 1)
+    run = 0
+    cut = False
+    for i in range(len(audio) // FRAME_SIZE):
+        if _frame_energy(audio[i * FRAME_SIZE:(i + 1) * FRAME_SIZE]) > state.last_end_th:
+            run += 1
+            if run >= needed:
+                cut = True
+                break
+        else:
+            run = 0
+
+    state.stats["cutoff_checks"] += 1
+    if cut:
+        state.stats["cutoffs"] += 1
+        if debug:
+            print("[VAD] Caller kept talking right after the endpoint → turn was cut off")
+    return cut
+
+
 def _calibrate_noise_floor(stream, debug: bool) -> float:
     frames = int(CALIBRATION_SECONDS / FRAME_DURATION)
     energies = []
@@ -41,94 +233,215 @@ def _calibrate_noise_floor(stream, debug: bool) -> float:
     return noise
 
 
-def record_until_silence(max_wait_seconds: float = 30.0, debug: bool = True):
-    global GLOBAL_NOISE_FLOOR
+class UtteranceDetector:
+    """
+    Incremental VAD state machine: push() one frame at a time, it returns True
+    once the utterance is over. Independent of where frames come from (blocking
+    stream.read(), the InputEngine callback ring, a WAV file).
+    """
 
-    start_time = time.time()
-    audio_frames = []
+    def __init__(self, state: VADState, partial_transcriber=None, debug: bool = True):
+        self.state = state
+        self.partial_transcriber = partial_transcriber
+        self.debug = debug
 
-    # counters
-    speech_frames = 0
-    start_gate_frames = 0
-    silence_frames = 0
+        self.audio_frames = []
 
-    had_speech = False
-    speech_locked = False
+        # counters
+        self.speech_frames = 0
+        self.start_gate_frames = 0
+        self.silence_frames = 0
 
-    start_gate_needed = int(MIN_START_SPEECH_SECONDS / FRAME_DURATION)
-    lock_needed = int(MIN_SPEECH_DURATION / FRAME_DURATION)
-    end_silence_needed = int(END_SILENCE_SECONDS / FRAME_DURATION)
+        self.had_speech = False
+        self.speech_locked = False
+        self.partial_checked = False
+        self.ended_by_silence = False
 
-    stream = sd.InputStream(
-        channels=1,
-        samplerate=SAMPLE_RATE,
-        blocksize=FRAME_SIZE,
-        dtype="float32",
-    )
+        # partial transcript of the current pause: runs synchronously inside
+        # push(), so the endpoint cannot come before it returns
+        self.partial_at_frames = 0
+        self.partial_ms = 0
 
-    with stream:
-        if GLOBAL_NOISE_FLOOR is None:
-            GLOBAL_NOISE_FLOOR = _calibrate_noise_floor(stream, debug)
+        self.start_gate_needed = int(MIN_START_SPEECH_SECONDS / FRAME_DURATION)
+        self.lock_needed = int(MIN_SPEECH_DURATION / FRAME_DURATION)
+        self.endpointer = Endpointer()
+        self.end_silence_needed = self.endpointer.base_frames
 
-        noise = GLOBAL_NOISE_FLOOR
-        start_th = max(noise * 1.8, 0.003)
-        end_th = max(noise * 2.5, 0.005)
+        self.noise = state.noise_floor
+        self._set_thresholds()
 
         if debug:
             print(
-                f"[VAD] Using noise_floor={noise:.8f} "
-                f"start_th={start_th:.6f} end_th={end_th:.6f}"
+                f"[VAD] Using noise_floor={self.noise:.8f} "
+                f"start_th={self.start_th:.6f} end_th={self.end_th:.6f}"
             )
             print("[VAD] Listening...")
 
+    def _set_thresholds(self):
+        self.start_th = max(self.noise * 1.8, 0.003)
+        self.end_th = max(self.noise * 2.5, 0.005)
+
+    def push(self, frame: np.ndarray) -> bool:
+        energy = _frame_energy(frame)
+        self.audio_frames.append(frame)
+
+        # -------- noise floor tracking (before speech only) --------
+        # thresholds are frozen once speech is confirmed: a soft phrase ending
+        # must not raise end_th and turn real speech into "silence"
+        if ADAPTIVE_ENDPOINTING and not self.had_speech and energy < self.start_th:
+            self.noise = (1 - NOISE_TRACK_ALPHA) * self.noise + NOISE_TRACK_ALPHA * energy
+            self._set_thresholds()
+
+        # -------- BEFORE speech --------
+        if not self.had_speech:
+            if energy > self.start_th:
+                self.start_gate_frames += 1
+                if self.start_gate_frames >= self.start_gate_needed:
+                    self.had_speech = True
+                    self.speech_frames = self.start_gate_frames
+                    if self.debug:
+                        print("[VAD] Speech CONFIRMED (gate passed)")
+            else:
+                self.start_gate_frames = 0
+            return False
+
+        # -------- AFTER speech --------
+        if energy > self.end_th:
+            self.speech_frames += 1
+            self.silence_frames = 0
+            self.partial_checked = False
+            self.partial_ms = 0
+            self.endpointer.observe_speech(frame, energy)
+
+            if not self.speech_locked and self.speech_frames >= self.lock_needed:
+                self.speech_locked = True
+                if self.debug:
+                    print("[VAD] Speech LOCKED")
+        else:
+            self.silence_frames += 1
+
+            if self.silence_frames == 1:
+                self.end_silence_needed = self.endpointer.on_pause()
+
+            if (
+                self.partial_transcriber is not None
+                and self.speech_locked
+                and not self.partial_checked
+                and self.silence_frames >= self.endpointer.min_frames
+            ):
+                self.partial_checked = True
+                self.partial_at_frames = self.silence_frames
+                t0 = time.perf_counter()
+                partial = self.partial_transcriber(
+                    np.concatenate(self.audio_frames, axis=0).reshape(-1), SAMPLE_RATE
+                )
+                self.partial_ms = int((time.perf_counter() - t0) * 1000)
+                self.end_silence_needed = self.endpointer.on_partial(partial, self.end_silence_needed)
+                if self.debug:
+                    print(f"[VAD] Partial ({self.partial_ms} ms): '{partial}' → {self.endpointer.reason}")
+
+        if self.speech_locked and self.silence_frames >= self.end_silence_needed:
+            self.ended_by_silence = True
+            if self.debug:
+                print("[VAD] End-of-utterance → stopping")
+            return True
+
+        return False
+
+    def finish(self):
+        """Updates the call's noise floor / endpoint stats, returns (audio | None, sr)."""
+        state = self.state
+        state.noise_floor = self.noise
+        state.last_end_th = self.end_th
+
+        if not self.had_speech:
+            if self.debug:
+                print("[VAD] No speech detected")
+            return None, SAMPLE_RATE
+
+        state.last_turn_ended_early = False
+        if self.ended_by_silence:
+            base_ms = int(self.endpointer.base_frames * FRAME_DURATION * 1000)
+            silence_ms = int(self.end_silence_needed * FRAME_DURATION * 1000)
+            # the caller waits for the silence AND for the partial decode that
+            # started during it (frames read after it are already buffered)
+            if self.partial_ms:
+                wait_ms = max(silence_ms, int(self.partial_at_frames * FRAME_DURATION * 1000) + self.partial_ms)
+            else:
+                wait_ms = silence_ms
+            saved_ms = base_ms - wait_ms
+
+            state.stats["turns"] += 1
+            state.stats["saved_ms"] += saved_ms
+            if silence_ms < base_ms:
+                state.stats["shortened_turns"] += 1
+                state.last_turn_ended_early = True
+            elif silence_ms > base_ms:
+                state.stats["extended_turns"] += 1
+            if self.debug:
+                print(
+                    f"[VAD] Endpoint after {silence_ms} ms silence + {wait_ms - silence_ms} ms decode "
+                    f"({self.endpointer.reason}, saved {saved_ms} ms vs fixed)"
+                )
+
+        buffer = np.concatenate(self.audio_frames, axis=0).reshape(-1).astype("float32")
+
+        if self.debug:
+            print(f"[VAD] Captured audio: {len(buffer)/SAMPLE_RATE:.2f}s")
+
+        return buffer, SAMPLE_RATE
+
+
+def record_until_silence(
+    max_wait_seconds: float = 30.0,
+    debug: bool = True,
+    partial_transcriber=None,
+    stream=None,
+    state: VADState = None,
+):
+    """
+    state: per-call VADState (default: one process-wide state).
+
+    stream: optional object with read(n) -> (frames, overflowed) used as a
+    context manager instead of a new microphone InputStream (call simulator,
+    persistent InputEngine).
+
+    partial_transcriber: optional callable (audio: np.ndarray, samplerate) -> str.
+    Called once per pause, after MIN_END_SILENCE_SECONDS, to let the endpointer
+    end early on a complete phrase or wait longer on an unfinished one.
+    """
+    if state is None:
+        state = _default_state
+
+    start_time = time.time()
+
+    if stream is None:
+        stream = sd.InputStream(
+            channels=1,
+            samplerate=SAMPLE_RATE,
+            blocksize=FRAME_SIZE,
+            dtype="float32",
+        )
+
+    with stream:
+        if state.noise_floor is None:
+            state.noise_floor = _calibrate_noise_floor(stream, debug)
+
+        detector = UtteranceDetector(state, partial_transcriber, debug)
+
         while True:
             if time.time() - start_time > max_wait_seconds:
                 if debug:
                     print("[VAD] Timeout → stopping")
                 break
 
-            frame, _ = stream.read(FRAME_SIZE)
-            energy = _frame_energy(frame)
-            audio_frames.append(frame)
-
-            # -------- BEFORE speech --------
-            if not had_speech:
-                if energy > start_th:
-                    start_gate_frames += 1
-                    if start_gate_frames >= start_gate_needed:
-                        had_speech = True
-                        speech_frames = start_gate_frames
-                        if debug:
-                            print("[VAD] Speech CONFIRMED (gate passed)")
-                else:
-                    start_gate_frames = 0
-                continue
-
-            # -------- AFTER speech --------
-            if energy > end_th:
-                speech_frames += 1
-                silence_frames = 0
-
-                if not speech_locked and speech_frames >= lock_needed:
-                    speech_locked = True
-                    if debug:
-                        print("[VAD] Speech LOCKED")
-            else:
-                silence_frames += 1
-
-            if speech_locked and silence_frames >= end_silence_needed:
+            frame, overflowed = stream.read(FRAME_SIZE)
+            if overflowed:
+                # audio was dropped – e.g. while a partial decode blocked this loop
+                state.stats["input_overflows"] += 1
                 if debug:
-                    print("[VAD] End-of-utterance → stopping")
+                    print("[VAD] WARNING: input overflow – audio dropped mid-utterance")
+            if detector.push(frame):
                 break
 
-    if not had_speech:
-        if debug:
-            print("[VAD] No speech detected")
-        return None, SAMPLE_RATE
-
-    buffer = np.concatenate(audio_frames, axis=0).reshape(-1).astype("float32")
-
-    if debug:
-        print(f"[VAD] Captured audio: {len(buffer)/SAMPLE_RATE:.2f}s")
-
-    return buffer, SAMPLE_RATE
+    return detector.finish()
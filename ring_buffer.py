@@ -0,0 +1,77 @@
+# ring_buffer.py
+"""
+Preallocated float32 ring buffer for one producer and one consumer thread
+(PortAudio callback on one side, turn loop / TTS worker on the other).
+
+Positions are monotonic sample counters: the producer only advances
+write_pos, the consumer only advances read_pos, and write_pos is published
+after the samples are in place – so no lock is needed.
+"""
+
+import numpy as np
+
+
+class SPSCRing:
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._buf = np.zeros(self.capacity, dtype=np.float32)
+        self.write_pos = 0
+        self.read_pos = 0
+
+    def available(self) -> int:
+        """Samples written but not yet consumed."""
+        return self.write_pos - self.read_pos
+
+    def free(self) -> int:
+        return self.capacity - self.available()
+
+    # --------------------------------------------------
+    # producer
+    # --------------------------------------------------
+
+    def store(self, pos: int, data: np.ndarray, add: bool = False):
+        """Writes (or adds) `data` at absolute position `pos` without publishing it."""
+        start = pos % self.capacity
+        first = min(len(data), self.capacity - start)
+        if add:
+            self._buf[start:start + first] += data[:first]
+            self._buf[:len(data) - first] += data[first:]
+        else:
+            self._buf[start:start + first] = data[:first]
+            self._buf[:len(data) - first] = data[first:]
+
+    def publish(self, pos: int):
+        self.write_pos = pos
+
+    def push(self, data: np.ndarray) -> bool:
+        """Appends and publishes `data`; False (nothing written) if it does not fit."""
+        w = self.write_pos
+        if w + len(data) - self.read_pos > self.capacity:
+            return False
+        self.store(w, data)
+        self.write_pos = w + len(data)
+        return True
+
+    # --------------------------------------------------
+    # consumer
+    # --------------------------------------------------
+
+    def copy(self, pos: int, out: np.ndarray):
+        """Copies len(out) samples starting at absolute position `pos` (no advance)."""
+        start = pos % self.capacity
+        first = min(len(out), self.capacity - start)
+        out[:first] = self._buf[start:start + first]
+        if len(out) > first:
+            out[first:] = self._buf[:len(out) - first]
+
+    def pop_into(self, out: np.ndarray) -> int:
+        """Moves up to len(out) samples into `out`; returns how many."""
+        r = self.read_pos
+        n = min(len(out), self.write_pos - r)
+        if n > 0:
+            self.copy(r, out[:n])
+            self.read_pos = r + n
+        return n
+
+    def skip_all(self):
+        self.read_pos = self.write_pos
@@ -0,0 +1,7 @@
+"""
+Call simulator – drives the real VAD / STT / turn loop from WAV files.
+"""
+from .latency import LatencyDist
+from .file_stream import FileInputStream
+
+__all__ = ['LatencyDist', 'FileInputStream']
@@ -0,0 +1,3 @@
+from .call_simulator import main
+
+main()
@@ -0,0 +1,192 @@
+# sim/call_simulator.py
+"""
+File-driven call simulator – load-tests the full pipeline without a phone line.
+
+Each call script is a directory of caller turns (turn_01.wav, turn_02.wav, ...).
+Turns are streamed through the real record_until_silence() VAD, STTManager and
+main.run_call() turn loop; the LLM and TTS services are replaced by local
+stand-ins with configurable latency distributions.
+
+  python -m sim --scripts sim_calls/ --parallel 8 --calls 40 --speed 4
+
+--scripts may also point at a single directory of WAVs (one call script).
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from conversation_saver import ConversationSaver
+from llm.llm_stub import StubLLM
+from main import run_call
+from recorder_vad import (
+    SAMPLE_RATE,
+    CUTOFF_RESUME_SECONDS,
+    VADState,
+    check_cutoff,
+    endpoint_report,
+    record_until_silence,
+)
+from stt.stt_manager import STTManager
+from tts.tts_openai import TTSPipeline
+
+from .file_stream import FileInputStream
+from .latency import LatencyDist
+
+STAGES = [
+    "record_ms",
+    "stt_ms",
+    "llm_first_chunk_ms",
+    "llm_total_ms",
+    "first_audio_ms",
+    "first_filler_ms",
+    "speak_wait_ms",
+    "total_ms",
+]
+
+TTS_SAMPLE_RATE = 24000
+TTS_CHARS_PER_SECOND = 14.0   # rough Hebrew speaking rate
+
+
+def load_scripts(root: str):
+    """Returns a list of call scripts, each a sorted list of WAV paths."""
+    def wavs(d):
+        return sorted(
+            os.path.join(d, f) for f in os.listdir(d) if f.lower().endswith(".wav")
+        )
+
+    subdirs = sorted(
+        os.path.join(root, d) for d in os.listdir(root)
+        if os.path.isdir(os.path.join(root, d))
+    )
+    scripts = [w for w in (wavs(d) for d in subdirs) if w]
+    if not scripts and wavs(root):
+        scripts = [wavs(root)]
+    return scripts
+
+
+def make_stub_tts(synth_latency: LatencyDist, speed: float) -> TTSPipeline:
+    """TTS stand-in: sampled synthesis latency, silent audio of a realistic length."""
+
+    def synthesize(text):
+        time.sleep(synth_latency())
+        seconds = max(len(text) / TTS_CHARS_PER_SECOND, 0.3)
+        return np.zeros(int(seconds * TTS_SAMPLE_RATE), dtype=np.float32), TTS_SAMPLE_RATE
+
+    def play(data, sr):
+        time.sleep(len(data) / sr / speed)
+
+    return TTSPipeline(synthesize=synthesize, play=play, debug=False)
+
+
+def simulate_call(script, stt, llm, tts, speed: float, save_dir: str = None, vad_state: VADState = None):
+    turns = iter(script)
+    if vad_state is None:
+        vad_state = VADState()   # noise floor / endpoint stats of this call only
+
+    def listen(stt):
+        path = next(turns, None)
+        if path is None:
+            return None  # script over → caller hangs up
+        stream = FileInputStream(path, speed=speed)
+        result = record_until_silence(
+            debug=False,
+            partial_transcriber=stt.quick_transcribe if stt.small else None,
+            stream=stream,
+            state=vad_state,
+        )
+        # the rest of the file is what the caller said after the endpoint
+        check_cutoff(vad_state, stream.peek(int(CUTOFF_RESUME_SECONDS * SAMPLE_RATE)))
+        return result
+
+    saver = ConversationSaver(output_dir=save_dir) if save_dir else _NullSaver()
+    timings = run_call(saver, stt, listen, llm.ask_stream, tts, log=_quiet)
+    saver.save()
+    return timings
+
+
+class _NullSaver:
+    def add_user(self, text):
+        pass
+
+    def add_ai(self, text):
+        pass
+
+    def save(self):
+        pass
+
+
+def _quiet(*args, **kwargs):
+    pass
+
+
+def print_report(timings, wall_s: float, calls: int, parallel: int):
+    print("\n[SIM] ========== Report ==========")
+    print(
+        f"[SIM] calls={calls} parallel={parallel} turns={len(timings)} "
+        f"wall={wall_s:.1f}s calls/min={calls / wall_s * 60:.1f}"
+    )
+    print(f"[SIM] {'stage':<20}{'p50':>8}{'p95':>8}{'p99':>8}   (ms)")
+    for stage in STAGES:
+        values = [t[stage] for t in timings if t.get(stage) is not None]
+        if not values:
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        print(f"[SIM] {stage:<20}{int(p50):>8}{int(p95):>8}{int(p99):>8}")
+
+
+def main():
+    p = argparse.ArgumentParser(description="File-driven call simulator")
+    p.add_argument("--scripts", required=True, help="dir of call dirs (or a dir of turn WAVs)")
+    p.add_argument("--calls", type=int, default=0, help="total calls (default: one per script)")
+    p.add_argument("--parallel", type=int, default=1)
+    p.add_argument("--speed", type=float, default=1.0, help="caller audio / playback speed-up (N×)")
+    p.add_argument("--llm-ttft", default="400:1200", help="LLM first-token latency p50:p95 ms")
+    p.add_argument("--llm-chunk", default="60:150", help="LLM inter-chunk latency p50:p95 ms")
+    p.add_argument("--tts-latency", default="350:900", help="TTS synthesis latency p50:p95 ms")
+    p.add_argument("--save", default="", help="save simulated conversations to this dir")
+    args = p.parse_args()
+
+    scripts = load_scripts(args.scripts)
+    if not scripts:
+        raise SystemExit(f"[SIM] No WAV turns found under {args.scripts}")
+
+    total = args.calls or len(scripts)
+    print(f"[SIM] {len(scripts)} scripts, {total} calls, parallel={args.parallel}, speed={args.speed}x")
+
+    # one shared STT (as on a real box serving several calls)
+    stt = STTManager()
+
+    lock = threading.Lock()
+    all_timings = []
+    vad_totals = VADState()
+
+    def one(i):
+        llm = StubLLM(LatencyDist.parse(args.llm_ttft), LatencyDist.parse(args.llm_chunk))
+        tts = make_stub_tts(LatencyDist.parse(args.tts_latency), args.speed)
+        save_dir = os.path.join(args.save, f"call_{i + 1:04d}") if args.save else None
+        vad_state = VADState()
+        timings = simulate_call(scripts[i % len(scripts)], stt, llm, tts, args.speed, save_dir, vad_state)
+        with lock:
+            all_timings.extend(timings)
+            for key, value in vad_state.stats.items():
+                vad_totals.stats[key] += value
+        print(f"[SIM] call {i + 1}/{total} done ({len(timings)} turns)")
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+        for f in [pool.submit(one, i) for i in range(total)]:
+            f.result()
+    wall_s = time.perf_counter() - t0
+
+    stt.print_routing_report()
+    print(endpoint_report(vad_totals))
+    print_report(all_timings, wall_s, total, args.parallel)
+
+
+if __name__ == "__main__":
+    main()
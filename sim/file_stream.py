@@ -0,0 +1,71 @@
+# sim/file_stream.py
+"""
+WAV file that behaves like a sounddevice InputStream for record_until_silence().
+Frames are paced at real time divided by `speed`.
+"""
+
+import time
+import numpy as np
+import soundfile as sf
+
+from recorder_vad import SAMPLE_RATE
+
+
+class FileInputStream:
+    def __init__(
+        self,
+        path: str,
+        speed: float = 1.0,
+        lead_silence: float = 0.4,
+        tail_silence: float = 1.5,
+        noise_level: float = 1e-4,
+    ):
+        data, sr = sf.read(path, dtype="float32")
+        if data.ndim > 1:
+            data = data.mean(axis=1)
+
+        if sr != SAMPLE_RATE:
+            try:
+                import resampy
+                data = resampy.resample(data, sr, SAMPLE_RATE)
+            except ImportError:
+                n = int(len(data) * SAMPLE_RATE / sr)
+                data = np.interp(
+                    np.linspace(0, len(data) - 1, n), np.arange(len(data)), data
+                ).astype(np.float32)
+
+        # low noise before/after the turn: room for calibration and for the
+        # end-of-utterance silence the VAD waits for
+        rng = np.random.default_rng()
+        lead = rng.normal(0, noise_level, int(lead_silence * SAMPLE_RATE))
+        tail = rng.normal(0, noise_level, int(tail_silence * SAMPLE_RATE))
+        self.samples = np.concatenate([lead, data, tail]).astype(np.float32)
+
+        self.speed = max(speed, 1e-3)
+        self.pos = 0
+        self._t0 = None
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def read(self, frames: int):
+        chunk = self.samples[self.pos:self.pos + frames]
+        if len(chunk) < frames:
+            chunk = np.concatenate([chunk, np.zeros(frames - len(chunk), dtype=np.float32)])
+        self.pos += frames
+
+        # pace like a live device: block until this audio "has been captured"
+        due = self._t0 + (self.pos / SAMPLE_RATE) / self.speed
+        wait = due - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+
+        return chunk.reshape(-1, 1), False
+
+    def peek(self, frames: int) -> np.ndarray:
+        """The next `frames` samples without consuming them or pacing."""
+        return self.samples[self.pos:self.pos + frames]
@@ -0,0 +1,32 @@
+# sim/latency.py
+import math
+import random
+
+
+class LatencyDist:
+    """
+    Log-normal latency given its p50 and p95 (ms). Calling it returns seconds.
+
+    LatencyDist.parse("300:900") → p50=300 ms, p95=900 ms
+    LatencyDist.parse("250")     → fixed 250 ms
+    """
+
+    def __init__(self, p50_ms: float, p95_ms: float = None, seed=None):
+        self.p50_ms = p50_ms
+        self.p95_ms = p95_ms if p95_ms is not None else p50_ms
+        self.mu = math.log(max(p50_ms, 1e-3))
+        self.sigma = max(math.log(max(self.p95_ms, 1e-3)) - self.mu, 0.0) / 1.645
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def parse(cls, spec: str, seed=None):
+        parts = [float(x) for x in spec.split(":")]
+        return cls(parts[0], parts[1] if len(parts) > 1 else None, seed=seed)
+
+    def __call__(self) -> float:
+        if self.sigma == 0:
+            return self.p50_ms / 1000.0
+        return self._rng.lognormvariate(self.mu, self.sigma) / 1000.0
+
+    def __repr__(self):
+        return f"LatencyDist(p50={self.p50_ms}ms, p95={self.p95_ms}ms)"
@@ -0,0 +1,189 @@
+# stt/autotune.py
+"""
+STT autotuner – finds the fastest accurate Whisper decode settings for THIS host.
+
+Benchmarks compute_type × cpu_threads × num_workers × beam_size on a fixture
+set of Hebrew utterances (utt01.wav + utt01.txt reference transcript, ...) and
+measures latency, throughput and word-error rate.
+
+The winner (lowest p50 latency among configs whose WER is within
+--wer-tolerance of the best WER) is written to STT_PROFILE_PATH, which HFSTT
+loads at startup.
+
+  python -m stt.autotune --fixtures stt/fixtures_he
+  python -m stt.autotune --fixtures stt/fixtures_he --model stt/whisper-small-ct2
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import soundfile as sf
+
+from config import WHISPER_MODEL_PATH, STT_PROFILE_PATH
+from .hf_stt import HFSTT, host_fingerprint, profile_key
+
+_NIQQUD = re.compile("[\u0591-\u05C7]")
+_PUNCT = re.compile(r"[^\w\s]")
+
+
+def normalize_text(text: str) -> list:
+    text = _NIQQUD.sub("", text or "")
+    text = _PUNCT.sub(" ", text.lower())
+    return text.split()
+
+
+def word_errors(ref: str, hyp: str):
+    """Returns (edit distance in words, reference word count)."""
+    r, h = normalize_text(ref), normalize_text(hyp)
+    prev = list(range(len(h) + 1))
+    for i in range(1, len(r) + 1):
+        cur = [i] + [0] * len(h)
+        for j in range(1, len(h) + 1):
+            cur[j] = min(
+                prev[j] + 1,
+                cur[j - 1] + 1,
+                prev[j - 1] + (r[i - 1] != h[j - 1]),
+            )
+        prev = cur
+    return prev[-1], len(r)
+
+
+def load_fixtures(path: str):
+    fixtures = []
+    for name in sorted(os.listdir(path)):
+        if not name.lower().endswith(".wav"):
+            continue
+        ref_path = os.path.join(path, os.path.splitext(name)[0] + ".txt")
+        if not os.path.exists(ref_path):
+            print(f"[AUTOTUNE] Skipping {name}: no reference .txt")
+            continue
+        audio, sr = sf.read(os.path.join(path, name), dtype="float32")
+        with open(ref_path, "r", encoding="utf-8") as f:
+            fixtures.append((name, audio, sr, f.read().strip()))
+    return fixtures
+
+
+def benchmark(stt: HFSTT, fixtures, beam_size: int, workers: int) -> dict:
+    stt.beam_size = beam_size
+
+    # warm-up (first decode allocates)
+    _, audio, sr, _ = fixtures[0]
+    stt.transcribe_buffer(audio, sr)
+
+    # latency: one utterance at a time, like a live turn
+    latencies = []
+    errors = 0
+    ref_words = 0
+    for _, audio, sr, ref in fixtures:
+        t0 = time.perf_counter()
+        hyp = stt.transcribe_buffer(audio, sr)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        e, n = word_errors(ref, hyp)
+        errors += e
+        ref_words += n
+
+    # throughput: as many parallel decodes as the model has workers
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda f: stt.transcribe_buffer(f[1], f[2]), fixtures))
+    wall = time.perf_counter() - t0
+
+    audio_s = sum(len(a) / sr for _, a, sr, _ in fixtures)
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "throughput_utt_s": len(fixtures) / wall,
+        "rtf": wall / audio_s,
+        "wer": errors / max(ref_words, 1),
+    }
+
+
+def _int_list(s: str):
+    return [int(x) for x in s.split(",") if x.strip()]
+
+
+def main():
+    cores = os.cpu_count() or 4
+
+    p = argparse.ArgumentParser(description="Autotune Whisper decode settings for this host")
+    p.add_argument("--fixtures", required=True, help="dir of <name>.wav + <name>.txt")
+    p.add_argument("--model", default=WHISPER_MODEL_PATH)
+    p.add_argument("--device", default="cpu", choices=["cpu", "cuda"])
+    p.add_argument("--compute-types", default="int8,int8_float32,float32")
+    p.add_argument("--cpu-threads", default=",".join(str(x) for x in sorted({0, 2, 4, cores})))
+    p.add_argument("--num-workers", default="1,2,4")
+    p.add_argument("--beam-sizes", default="1,3")
+    p.add_argument("--wer-tolerance", type=float, default=0.02)
+    p.add_argument("--profile", default=STT_PROFILE_PATH)
+    args = p.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        raise SystemExit(f"[AUTOTUNE] No fixtures found in {args.fixtures}")
+    print(f"[AUTOTUNE] {len(fixtures)} fixtures, model={args.model}, device={args.device}")
+
+    results = []
+    grid = itertools.product(
+        args.compute_types.split(","),
+        _int_list(args.cpu_threads),
+        _int_list(args.num_workers),
+    )
+    for compute_type, cpu_threads, num_workers in grid:
+        settings = {
+            "compute_type": compute_type,
+            "cpu_threads": cpu_threads,
+            "num_workers": num_workers,
+        }
+        try:
+            stt = HFSTT(model_path=args.model, device=args.device, settings=settings)
+        except Exception as e:
+            print(f"[AUTOTUNE] {settings} not supported here: {e}")
+            continue
+
+        for beam_size in _int_list(args.beam_sizes):
+            m = benchmark(stt, fixtures, beam_size, num_workers)
+            cfg = dict(settings, beam_size=beam_size)
+            results.append((cfg, m))
+            print(
+                f"[AUTOTUNE] {cfg} → p50={m['p50_ms']:.0f} ms p95={m['p95_ms']:.0f} ms "
+                f"thr={m['throughput_utt_s']:.2f} utt/s rtf={m['rtf']:.3f} wer={m['wer']:.3f}"
+            )
+
+        del stt
+
+    if not results:
+        raise SystemExit("[AUTOTUNE] No configuration could be benchmarked")
+
+    best_wer = min(m["wer"] for _, m in results)
+    eligible = [r for r in results if r[1]["wer"] <= best_wer + args.wer_tolerance]
+    best_cfg, best_m = min(eligible, key=lambda r: (r[1]["p50_ms"], -r[1]["throughput_utt_s"]))
+
+    profile = {"host": host_fingerprint(), "models": {}}
+    if os.path.exists(args.profile):
+        with open(args.profile, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        if old.get("host") == profile["host"]:
+            profile["models"] = old.get("models", {})
+
+    profile["models"][profile_key(args.model, args.device)] = {
+        "device": args.device,
+        "settings": best_cfg,
+        "metrics": best_m,
+        "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+    with open(args.profile, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+
+    print(f"[AUTOTUNE] Best: {best_cfg} (p50={best_m['p50_ms']:.0f} ms, wer={best_m['wer']:.3f})")
+    print(f"[AUTOTUNE] Profile written → {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ HuggingFace Whisper STT - optimized for Hebrew + low latency.
 Uses direct numpy buffer transcription (no file I/O) when possible.
 """
 import os
+import json
 import numpy as np
 import sounddevice as sd
 import soundfile as sf
@@ -23,11 +24,70 @@ except Exception as e:
     WhisperModel = None
     _whisper_import_error = e
 
-from config import WHISPER_MODEL_PATH
+from config import WHISPER_MODEL_PATH, STT_PROFILE_PATH
+
+DEFAULT_DECODE_SETTINGS = {
+    "compute_type": "int8",
+    "cpu_threads": 0,     # 0 = CTranslate2 default
+    "num_workers": 2,
+    "beam_size": 1,
+}
+
+
+def host_fingerprint() -> dict:
+    """Identifies the CPU a tuning profile was measured on."""
+    import platform
+
+    cpu = platform.processor() or ""
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    cpu = line.split(":", 1)[1].strip()
+                    break
+    except OSError:
+        pass
+
+    return {"cpu": cpu, "cpu_count": os.cpu_count()}
+
+
+def profile_key(model_path: str, device: str) -> str:
+    """Profile entries are per model AND device (cpu / cuda tune differently)."""
+    return f"{model_path}@{device}"
+
+
+def load_tuned_settings(model_path: str, device: str, profile_path: str = STT_PROFILE_PATH):
+    """
+    Returns the autotuned decode settings for this model on this host, or None.
+    Profiles are written by `python -m stt.autotune`.
+    """
+    if not profile_path or not os.path.exists(profile_path):
+        return None
+
+    try:
+        with open(profile_path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except Exception as e:
+        print(f"[STT] WARNING: unreadable STT profile {profile_path}: {e}")
+        return None
+
+    if profile.get("host") != host_fingerprint():
+        print(f"[STT] WARNING: {profile_path} was tuned on another host – ignoring it")
+        return None
+
+    entry = profile.get("models", {}).get(profile_key(model_path, device))
+    if not entry:
+        return None
+
+    return {k: entry["settings"][k] for k in DEFAULT_DECODE_SETTINGS if k in entry["settings"]}
 
 
 class HFSTT:
-    def __init__(self, model_path=None, device="auto", use_fast_model=True):
+    def __init__(self, model_path=None, device="auto", use_fast_model=True, settings=None):
+        """
+        settings: explicit decode settings (see DEFAULT_DECODE_SETTINGS).
+        None → autotuned profile for this host if present, else defaults.
+        """
         print("[STT] Initializing HuggingFace Whisper STT...")
 
         if _torch_import_error is not None:
@@ -53,11 +113,23 @@ class HFSTT:
         print(f"[STT] Device: {self.device}")
         print(f"[STT] Model: {self.model_path}")
 
+        self.settings = dict(DEFAULT_DECODE_SETTINGS)
+        if settings is None:
+            tuned = load_tuned_settings(self.model_path, self.device)
+            if tuned:
+                self.settings.update(tuned)
+                print(f"[STT] Using autotuned settings: {self.settings}")
+        else:
+            self.settings.update(settings)
+
+        self.beam_size = self.settings["beam_size"]
+
         self.model = WhisperModel(
             self.model_path,
             device=self.device,
-            compute_type="int8",
-            num_workers=2,
+            compute_type=self.settings["compute_type"],
+            cpu_threads=self.settings["cpu_threads"],
+            num_workers=self.settings["num_workers"],
         )
         print("[STT] Whisper model loaded")
 
@@ -71,6 +143,15 @@ class HFSTT:
     # 🚀 Direct buffer transcription
     # ------------------------
     def transcribe_buffer(self, audio_data: np.ndarray, samplerate: int = 16000) -> str:
+        text, _ = self.transcribe_buffer_with_info(audio_data, samplerate)
+        return text
+
+    def transcribe_buffer_with_info(self, audio_data: np.ndarray, samplerate: int = 16000):
+        """
+        Returns (text, info) where info holds the decoder confidence:
+        - avg_logprob: duration-weighted over segments (None if no segments)
+        - no_speech_prob: max over segments
+        """
         try:
             if audio_data.dtype != np.float32:
                 audio_data = audio_data.astype(np.float32)
@@ -88,7 +169,7 @@ class HFSTT:
             segments, info = self.model.transcribe(
                 audio_data,
                 language="he",
-                beam_size=1,
+                beam_size=self.beam_size,
                 best_of=1,
                 temperature=0,
                 without_timestamps=True,
@@ -97,8 +178,22 @@ class HFSTT:
                 word_timestamps=False,
             )
 
-            text = " ".join(seg.text for seg in segments).strip()
-            return text
+            texts = []
+            logprob_sum = 0.0
+            weight_sum = 0.0
+            no_speech_prob = 0.0
+            for seg in segments:
+                texts.append(seg.text)
+                w = max(seg.end - seg.start, 1e-3)
+                logprob_sum += seg.avg_logprob * w
+                weight_sum += w
+                no_speech_prob = max(no_speech_prob, seg.no_speech_prob)
+
+            text = " ".join(texts).strip()
+            return text, {
+                "avg_logprob": logprob_sum / weight_sum if weight_sum else None,
+                "no_speech_prob": no_speech_prob,
+            }
 
         except Exception as e:
             print(f"[STT] ERROR transcribe_buffer: {e}")
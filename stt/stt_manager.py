@@ -7,6 +7,12 @@ Accepts:
 
 from dotenv import load_dotenv
 from .hf_stt import HFSTT
+from config import (
+    WHISPER_SMALL_MODEL_PATH,
+    TIERED_MAX_SECONDS,
+    TIERED_MIN_AVG_LOGPROB,
+    TIERED_MAX_NO_SPEECH_PROB,
+)
 import os
 import numpy as np
 import time
@@ -17,6 +23,32 @@ RUNPOD_STT_URL = os.getenv("RUNPOD_STT_URL", "").strip()
 # example:
 # https://usav84lb4hp73c-8000.proxy.runpod.net/transcribe
 
+STT_TIERED = os.getenv("STT_TIERED", "false").lower() == "true"
+
+
+def _speech_seconds(audio_buffer, samplerate: int, frame_seconds: float = 0.02) -> float:
+    """
+    Length of the speech span – first to last frame above an energy threshold
+    relative to the buffer's quietest frames. The VAD keeps calibration /
+    pre-gate audio and the end-of-utterance silence in the buffer, so a 0.4s
+    "כן" is ~2.5s long in total.
+    """
+    audio = np.asarray(audio_buffer, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+
+    frame = max(int(samplerate * frame_seconds), 1)
+    n = len(audio) // frame
+    if n == 0:
+        return 0.0
+
+    energy = np.sqrt(np.mean(audio[:n * frame].reshape(n, frame) ** 2, axis=1))
+    threshold = max(float(np.percentile(energy, 10)) * 2.5, 0.005)   # recorder_vad's end_th
+    speech = np.flatnonzero(energy > threshold)
+    if len(speech) == 0:
+        return 0.0
+    return (speech[-1] - speech[0] + 1) * frame / float(samplerate)
+
 
 class STTManager:
     def __init__(self):
@@ -24,6 +56,19 @@ class STTManager:
         self.hf = HFSTT()
         print("[STTManager] HF Whisper STT ready")
 
+        self.small = None
+        if STT_TIERED:
+            print("[STTManager] Tiered STT enabled – loading small Whisper...")
+            self.small = HFSTT(model_path=WHISPER_SMALL_MODEL_PATH)
+        self.route_stats = {
+            "small_accepted": 0,
+            "escalated": 0,
+            "direct_large": 0,
+            "small_ms": 0,
+            "large_ms": 0,
+            "escalated_changed_text": 0,
+        }
+
         self.runpod_url = RUNPOD_STT_URL
         if self.runpod_url:
             print(f"[STTManager] RunPod STT enabled: {self.runpod_url}")
@@ -119,10 +164,100 @@ class STTManager:
     # --------------------------------------------------
 
     def transcribe_file(self, filename: str) -> str:
-        return self.hf.transcribe_file(filename)
+        if self.small is None:
+            return self.hf.transcribe_file(filename)
+
+        import soundfile as sf
+        audio_buffer, samplerate = sf.read(filename, dtype="float32")
+        return self._transcribe_tiered(audio_buffer, samplerate)
 
     def transcribe_buffer(self, audio_buffer, samplerate: int) -> str:
-        return self.hf.transcribe_buffer(audio_buffer, samplerate)
+        if self.small is None:
+            return self.hf.transcribe_buffer(audio_buffer, samplerate)
+        return self._transcribe_tiered(audio_buffer, samplerate)
+
+    # --------------------------------------------------
+
+    def _transcribe_tiered(self, audio_buffer, samplerate: int) -> str:
+        """
+        Short utterance → small model; escalate to the large model when the
+        small model's avg_logprob is too low or no_speech_prob too high.
+        "Short" is measured on the speech span, not the whole buffer.
+        """
+        stats = self.route_stats
+        duration = _speech_seconds(audio_buffer, samplerate)
+
+        if duration > TIERED_MAX_SECONDS:
+            t0 = time.perf_counter()
+            text = self.hf.transcribe_buffer(audio_buffer, samplerate)
+            dt = int((time.perf_counter() - t0) * 1000)
+            stats["direct_large"] += 1
+            stats["large_ms"] += dt
+            print(f"[STT-ROUTE] {duration:.2f}s speech → large (too long) {dt} ms")
+            return text
+
+        t0 = time.perf_counter()
+        small_text, info = self.small.transcribe_buffer_with_info(audio_buffer, samplerate)
+        small_ms = int((time.perf_counter() - t0) * 1000)
+        stats["small_ms"] += small_ms
+
+        logprob = info["avg_logprob"]
+        no_speech = info["no_speech_prob"]
+        confident = (
+            logprob is not None
+            and logprob >= TIERED_MIN_AVG_LOGPROB
+            and no_speech <= TIERED_MAX_NO_SPEECH_PROB
+        )
+        conf = f"logprob={logprob if logprob is None else round(logprob, 3)} no_speech={no_speech:.3f}"
+
+        if confident:
+            stats["small_accepted"] += 1
+            print(f"[STT-ROUTE] {duration:.2f}s speech → small '{small_text}' {conf} accepted ({small_ms} ms)")
+            return small_text
+
+        t1 = time.perf_counter()
+        text = self.hf.transcribe_buffer(audio_buffer, samplerate)
+        large_ms = int((time.perf_counter() - t1) * 1000)
+        stats["escalated"] += 1
+        stats["large_ms"] += large_ms
+
+        changed = text.strip() != small_text.strip()
+        if changed:
+            stats["escalated_changed_text"] += 1
+
+        print(
+            f"[STT-ROUTE] {duration:.2f}s speech → small '{small_text}' {conf} → ESCALATED "
+            f"large '{text}' (small {small_ms} ms + large {large_ms} ms, "
+            f"{'text changed' if changed else 'same text'})"
+        )
+        return text
+
+    def quick_transcribe(self, audio_buffer, samplerate: int) -> str:
+        """Cheap partial transcript for the endpointer (small model, tiered mode only)."""
+        if self.small is None:
+            return ""
+        text, _ = self.small.transcribe_buffer_with_info(audio_buffer, samplerate)
+        return text
+
+    def print_routing_report(self):
+        if self.small is None:
+            return
+
+        s = self.route_stats
+        total = s["small_accepted"] + s["escalated"] + s["direct_large"]
+        if not total:
+            return
+
+        small_runs = s["small_accepted"] + s["escalated"]
+        large_runs = s["escalated"] + s["direct_large"]
+        print(
+            "[STT-ROUTE] Report: "
+            f"utterances={total} small_accepted={s['small_accepted']} "
+            f"escalated={s['escalated']} (text changed in {s['escalated_changed_text']}) "
+            f"direct_large={s['direct_large']} "
+            f"avg_small={s['small_ms'] // max(small_runs, 1)} ms "
+            f"avg_large={s['large_ms'] // max(large_runs, 1)} ms"
+        )
 
     def stop(self):
         if self.hf:
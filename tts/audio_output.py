@@ -0,0 +1,161 @@
+# tts/audio_output.py
+"""
+Persistent, gapless audio output.
+
+One long-lived sd.OutputStream pulls from a preallocated ring buffer.
+- single producer (TTS worker) / single consumer (PortAudio callback)
+  over ring_buffer.SPSCRing, so no lock is needed
+- chunks are resampled to the device rate ONCE, on append
+- consecutive chunks are overlap-added with a short crossfade when the
+  previous chunk's tail has not been played yet (otherwise: short fade-in)
+- played_position() = total samples handed to the device ("played up to N")
+"""
+
+import time
+import numpy as np
+import sounddevice as sd
+
+from ring_buffer import SPSCRing
+
+CROSSFADE_MS = 8
+# never touch samples this close to the read head (callback may be reading them)
+SAFETY_MS = 40
+# wait_until() gives up this long after the queued audio should have played
+# (stalled / aborted stream, unplugged device)
+WAIT_MARGIN_SECONDS = 2.0
+
+
+def resample(data: np.ndarray, sr_in: int, sr_out: int) -> np.ndarray:
+    if sr_in == sr_out:
+        return data.astype(np.float32, copy=False)
+    try:
+        import resampy
+        return resampy.resample(data, sr_in, sr_out).astype(np.float32)
+    except ImportError:
+        n = int(round(len(data) * sr_out / sr_in))
+        return np.interp(
+            np.linspace(0, len(data) - 1, n), np.arange(len(data)), data
+        ).astype(np.float32)
+
+
+class AudioOutputEngine:
+    def __init__(self, samplerate: int = None, capacity_seconds: float = 60.0, device=None):
+        if samplerate is None:
+            samplerate = int(sd.query_devices(device, "output")["default_samplerate"])
+        self.samplerate = samplerate
+
+        self._ring = SPSCRing(int(capacity_seconds * samplerate))
+
+        self._xfade = int(CROSSFADE_MS * samplerate / 1000)
+        self._safety = int(SAFETY_MS * samplerate / 1000)
+        ramp = np.linspace(0.0, 1.0, self._xfade, dtype=np.float32)
+        self._fade_in = ramp
+        self._fade_out = ramp[::-1].copy()
+
+        # set by the producer while it still has audio to deliver (TTS queue
+        # non-empty); running dry then is an underrun, not the end of an answer
+        self.expecting_audio = False
+        self._dry = False
+        self.underruns = 0
+        self.crossfades = 0
+        self.wait_timeouts = 0
+
+        self._stream = sd.OutputStream(
+            samplerate=samplerate,
+            channels=1,
+            dtype="float32",
+            latency="low",
+            device=device,
+            callback=self._callback,
+        )
+        self._stream.start()
+        print(f"[AUDIO-OUT] Output stream open @ {samplerate} Hz (latency {self._stream.latency * 1000:.0f} ms)")
+
+    # --------------------------------------------------
+    # consumer (PortAudio thread)
+    # --------------------------------------------------
+
+    def _callback(self, outdata, frames, time_info, status):
+        n = self._ring.pop_into(outdata[:, 0])
+
+        if n < frames:
+            outdata[n:, 0] = 0.0
+            if self.expecting_audio and not self._dry:
+                # ran dry while the next chunk was still being synthesized
+                self.underruns += 1
+            self._dry = True
+        else:
+            self._dry = False
+
+    # --------------------------------------------------
+    # producer (TTS worker)
+    # --------------------------------------------------
+
+    def append(self, data: np.ndarray, samplerate: int) -> int:
+        """Queues a chunk for gapless playback. Returns its end sample position."""
+        data = resample(np.asarray(data, dtype=np.float32).reshape(-1), samplerate, self.samplerate)
+        xf = self._xfade
+        if len(data) < 2 * xf:
+            data = np.pad(data, (0, 2 * xf - len(data)))
+
+        data = data.copy()
+        data[-xf:] *= self._fade_out   # so a drained stream never ends on a click
+
+        ring = self._ring
+        w = ring.write_pos
+        if ring.available() >= xf + self._safety:
+            # previous tail (already faded out) is still unplayed → overlap-add
+            head = data[:xf] * self._fade_in
+            ring.store(w - xf, head, add=True)
+            body = data[xf:]
+            pos = w
+            self.crossfades += 1
+        else:
+            data[:xf] *= self._fade_in
+            body = data
+            pos = w
+
+        # wait for room (ring full = more than capacity_seconds queued)
+        while not ring.push(body):
+            time.sleep(0.005)
+        return ring.write_pos
+
+    # --------------------------------------------------
+
+    def played_position(self) -> int:
+        return self._ring.read_pos
+
+    def queued_samples(self) -> int:
+        return self._ring.available()
+
+    def wait_until(self, position: int, timeout: float = None):
+        """
+        Blocks until the device has consumed samples up to `position`.
+        Default timeout: the audio still to play + WAIT_MARGIN_SECONDS, so a
+        stream that stopped consuming cannot hang the turn loop.
+        """
+        if timeout is None:
+            timeout = max(position - self._ring.read_pos, 0) / self.samplerate + WAIT_MARGIN_SECONDS
+        deadline = time.perf_counter() + timeout
+        while self._ring.read_pos < position:
+            if time.perf_counter() > deadline:
+                self.wait_timeouts += 1
+                print(
+                    f"[AUDIO-OUT] Output stalled: {position - self._ring.read_pos} samples "
+                    f"not played after {timeout:.1f}s → giving up"
+                )
+                return False
+            time.sleep(0.005)
+        # samples handed to PortAudio still have to leave the device buffer
+        time.sleep(self._stream.latency)
+        return True
+
+    def report(self) -> str:
+        return (
+            f"[AUDIO-OUT] underruns={self.underruns} crossfades={self.crossfades} "
+            f"wait_timeouts={self.wait_timeouts}"
+        )
+
+    def close(self):
+        self._stream.stop()
+        self._stream.close()
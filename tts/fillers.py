@@ -0,0 +1,126 @@
+# tts/fillers.py
+"""
+Latency masking with pre-synthesized fillers ("אממ", "רגע, בודקת"...).
+
+If the LLM has not produced its first chunk within FILLER_DEADLINE_MS, a short
+cached filler is queued on the TTS pipeline as ready audio, so the caller does
+not hear dead air. The real answer is queued right behind it on the same
+output. Fillers never go through ConversationSaver.
+"""
+
+import hashlib
+import os
+import queue
+import random
+import threading
+
+import soundfile as sf
+
+FILLER_TEXTS = [
+    "אממ",
+    "רגע, בודקת",
+    "שנייה אחת",
+    "אוקיי, רגע",
+    "כן, מסתכלת",
+]
+FILLER_CACHE_DIR = os.path.join(os.path.dirname(__file__), "filler_cache")
+FILLER_DEADLINE_MS = int(os.getenv("FILLER_DEADLINE_MS", "1000"))
+FILLER_REPEAT_MS = 2500      # a 2nd filler if the LLM is still silent this long after the 1st
+FILLER_MAX_PER_TURN = 2
+
+_END = object()
+
+
+class FillerBank:
+    def __init__(self, synthesize, texts=FILLER_TEXTS, cache_dir=FILLER_CACHE_DIR):
+        self.clips = []
+        self._last = None
+        self._rng = random.Random()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        for text in texts:
+            name = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12] + ".wav"
+            path = os.path.join(cache_dir, name)
+            try:
+                if os.path.exists(path):
+                    data, sr = sf.read(path, dtype="float32")
+                else:
+                    data, sr = synthesize(text)
+                    sf.write(path, data, sr)
+                self.clips.append((text, data, sr))
+            except Exception as e:
+                print(f"[FILLER] Could not prepare '{text}': {e}")
+
+        print(f"[FILLER] {len(self.clips)} fillers ready (deadline {FILLER_DEADLINE_MS} ms)")
+
+    def pick(self):
+        """Random filler, never the same one twice in a row."""
+        choices = [c for c in self.clips if c[0] != self._last] or self.clips
+        clip = self._rng.choice(choices)
+        self._last = clip[0]
+        return clip
+
+
+class FillerMasker:
+    def __init__(self, bank: FillerBank, deadline_ms: int = FILLER_DEADLINE_MS):
+        self.bank = bank
+        self.deadline_s = deadline_ms / 1000.0
+        self.turns = 0
+        self.turns_fired = 0
+        self.fillers_played = 0
+
+    def wrap(self, chunks, tts):
+        """
+        Re-yields `chunks`; while waiting for the FIRST one, queues fillers on
+        `tts` at the deadline (and again every FILLER_REPEAT_MS, max per turn).
+        """
+        self.turns += 1
+        if not self.bank.clips:
+            yield from chunks
+            return
+
+        q = queue.Queue()
+
+        def pump():
+            try:
+                for chunk in chunks:
+                    q.put(chunk)
+            except Exception as e:
+                q.put(e)
+            finally:
+                q.put(_END)
+
+        threading.Thread(target=pump, name="filler-pump", daemon=True).start()
+
+        fired = 0
+        timeout = self.deadline_s
+        while True:
+            try:
+                item = q.get(timeout=timeout)
+                break
+            except queue.Empty:
+                if fired >= FILLER_MAX_PER_TURN:
+                    timeout = None
+                    continue
+                text, data, sr = self.bank.pick()
+                print(f"[FILLER] No LLM output after {int(self.deadline_s * 1000)} ms → '{text}'")
+                tts.play_audio(data, sr)
+                fired += 1
+                self.fillers_played += 1
+                timeout = FILLER_REPEAT_MS / 1000.0
+
+        if fired:
+            self.turns_fired += 1
+
+        while item is not _END:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+            item = q.get()
+
+    def report(self) -> str:
+        rate = self.turns_fired / self.turns if self.turns else 0.0
+        return (
+            f"[FILLER] Report: turns={self.turns} turns_with_filler={self.turns_fired} "
+            f"({rate:.0%}) fillers_played={self.fillers_played}"
+        )
@@ -1,4 +1,5 @@
 # tts/tts_openai.py
+import io
 import os
 import threading
 import queue
@@ -7,62 +8,157 @@ import sounddevice as sd
 import soundfile as sf
 from openai import OpenAI
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from .audio_output import AudioOutputEngine
+
+# one long-lived output stream (gapless) vs. sd.play()/sd.wait() per chunk
+TTS_PERSISTENT_OUTPUT = os.getenv("TTS_PERSISTENT_OUTPUT", "true").lower() == "true"
 
-_tts_queue = queue.Queue()
-_worker_running = False
-_worker_thread = None
-
-
-def _tts_worker():
-    global _worker_running
-    _worker_running = True
-
-    while True:
-        text = _tts_queue.get()
-        if text is None:
-            break
-
-        try:
-            print(f"[TTS] ▶ Speaking: {text}")
-
-            response = client.audio.speech.create(
-                model="gpt-4o-mini-tts",
-                voice="shimmer",
-                input=text,
-                response_format="wav",
+_client = None
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
+
+
+def synthesize_openai(text: str):
+    """Text → (float32 mono samples, samplerate) via OpenAI TTS."""
+    response = _get_client().audio.speech.create(
+        model="gpt-4o-mini-tts",
+        voice="shimmer",
+        input=text,
+        response_format="wav",
+    )
+
+    data, sr = sf.read(io.BytesIO(response.read()), dtype="float32")
+    if data.ndim > 1:
+        data = data[:, 0]
+    return data, sr
+
+
+def play_sounddevice(data, sr):
+    sd.play(data, sr)
+    sd.wait()
+
+
+class TTSPipeline:
+    """
+    Background TTS worker: speak_text() queues text, the worker synthesizes
+    and plays chunks in order.
+
+    synthesize(text) -> (samples, sr) and play(samples, sr) are pluggable so
+    the simulator can swap in local stand-ins.
+
+    With an AudioOutputEngine as `output`, chunks are appended to its ring
+    buffer instead of played one by one, so the worker synthesizes the next
+    chunk while the current one is still playing.
+    """
+
+    def __init__(self, synthesize=synthesize_openai, play=play_sounddevice, output=None, debug=True):
+        self.synthesize = synthesize
+        self.play = play
+        self.output = output
+        self.debug = debug
+
+        # output sample position where the last queued chunk ends
+        self._spoken_until = 0
+
+        self._queue = queue.Queue()
+        self._worker_running = False
+        self._worker_thread = None
+
+        # perf_counter() when the first synthesized answer chunk after
+        # mark_turn_start() was handed to the output; fillers are tracked apart
+        self.first_audio_at = None
+        self.first_filler_at = None
+
+    def _worker(self):
+        self._worker_running = True
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self.output is not None:
+                self.output.expecting_audio = True
+
+            try:
+                if isinstance(item, tuple):
+                    # pre-rendered audio (fillers)
+                    data, sr = item
+                    if self.first_filler_at is None:
+                        self.first_filler_at = time.perf_counter()
+                else:
+                    if self.debug:
+                        print(f"[TTS] ▶ Speaking: {item}")
+                    data, sr = self.synthesize(item)
+                    if self.first_audio_at is None:
+                        self.first_audio_at = time.perf_counter()
+
+                if self.output is not None:
+                    self._spoken_until = self.output.append(data, sr)
+                else:
+                    self.play(data, sr)
+
+            except Exception as e:
+                print(f"[TTS] ERROR: {e}")
+
+            finally:
+                self._queue.task_done()
+                if self.output is not None and self._queue.unfinished_tasks == 0:
+                    # queue drained: the output may now run out without an underrun
+                    self.output.expecting_audio = False
+
+        self._worker_running = False
+
+    def mark_turn_start(self):
+        self.first_audio_at = None
+        self.first_filler_at = None
+
+    def speak_text(self, text: str):
+        if not self._worker_running:
+            self._worker_running = True
+            self._worker_thread = threading.Thread(
+                target=self._worker, name="tts-worker", daemon=True
             )
+            self._worker_thread.start()
 
-            audio_bytes = response.read()
-
-            with open("tts_latest.wav", "wb") as f:
-                f.write(audio_bytes)
+        if self.output is not None:
+            self.output.expecting_audio = True
+        self._queue.put(text)
 
-            data, sr = sf.read("tts_latest.wav", dtype="float32")
-            if data.ndim > 1:
-                data = data[:, 0]
+    def play_audio(self, data, sr):
+        """Queues ready audio in order with the text chunks (no synthesis)."""
+        self.speak_text((data, sr))
 
-            sd.play(data, sr)
-            sd.wait()
+    def wait_until_all_spoken(self):
+        self._queue.join()
+        if self.output is not None:
+            self.output.wait_until(self._spoken_until)
 
-        except Exception as e:
-            print(f"[TTS] ERROR: {e}")
+    def played_position(self):
+        """Output samples played so far (None without a persistent output)."""
+        if self.output is None:
+            return None
+        return self.output.played_position()
 
-        finally:
-            _tts_queue.task_done()
 
-    _worker_running = False
+_default_pipeline = None
 
 
-def speak_text(text: str):
-    global _worker_thread
+def get_default_pipeline() -> TTSPipeline:
+    global _default_pipeline
+    if _default_pipeline is None:
+        output = AudioOutputEngine() if TTS_PERSISTENT_OUTPUT else None
+        _default_pipeline = TTSPipeline(output=output)
+    return _default_pipeline
 
-    if not _worker_running:
-        _worker_thread = threading.Thread(target=_tts_worker, daemon=True)
-        _worker_thread.start()
 
-    _tts_queue.put(text)
+def speak_text(text: str):
+    get_default_pipeline().speak_text(text)
 
 
 def wait_until_all_spoken():
-    _tts_queue.join()
+    get_default_pipeline().wait_until_all_spoken()
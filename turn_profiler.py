@@ -0,0 +1,221 @@
+# turn_profiler.py
+"""
+On-demand per-turn profiling.
+
+Enable with env:
+- PROFILE_CALL=true          → profile every turn of the call
+- PROFILE_EVERY_N_TURNS=N    → profile turns N, 2N, 3N...
+
+For a profiled turn we capture:
+- a wall-clock sampling profile of ALL threads, written as collapsed stacks
+  (flamegraph.pl / speedscope input). Blocked threads are sampled too
+  (tts-worker in queue.get, llm-* in socket reads...), so the tables leave out
+  samples whose leaf frame is an idle wait (IDLE_LEAF_FUNCTIONS) and give the
+  turn loop (MainThread) and tts-worker their own tables
+- sampler wake-up lateness, a proxy for GIL contention
+- a tracemalloc snapshot diff (turn end vs turn start)
+
+Files go next to the conversation JSON:
+  conversations/conversation_<call_id>_turn003_cpu.folded
+  conversations/conversation_<call_id>_turn003_profile.txt
+
+When disabled, start_turn()/end_turn() are a single attribute check.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+PROFILE_CALL = os.getenv("PROFILE_CALL", "false").lower() == "true"
+PROFILE_EVERY_N_TURNS = int(os.getenv("PROFILE_EVERY_N_TURNS", "0") or 0)
+PROFILE_SAMPLE_MS = float(os.getenv("PROFILE_SAMPLE_MS", "5"))
+
+TOP_N = 25
+THREAD_TOP_N = 10
+
+# leaf frames that mean "blocked, not running" (Condition.wait, Queue.get,
+# socket / ssl reads, selectors, time.sleep callers, Thread.join...)
+IDLE_LEAF_FUNCTIONS = frozenset({
+    "wait", "wait_until", "get", "read", "readinto", "recv", "recv_into",
+    "select", "poll", "sleep", "acquire", "join", "_wait_for_tstate_lock", "accept",
+})
+# threads that get their own busy table
+FOCUS_THREADS = ("MainThread", "tts-worker")
+
+
+class _StackSampler(threading.Thread):
+    def __init__(self, interval_s: float):
+        super().__init__(name="turn-profiler", daemon=True)
+        self.interval_s = interval_s
+        self.stacks = {}        # "thread;file:func;..." -> samples
+        self.samples = 0
+        self.lateness_ms = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        expected = time.perf_counter() + self.interval_s
+
+        while not self._stop_event.wait(self.interval_s):
+            now = time.perf_counter()
+            # a late wake-up means the sampler could not get the GIL
+            self.lateness_ms.append(max(now - expected, 0.0) * 1000)
+            expected = now + self.interval_s
+
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                parts.append(names.get(ident, str(ident)))
+                key = ";".join(reversed(parts))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=2.0)
+
+
+class TurnProfiler:
+    def __init__(
+        self,
+        output_dir: str,
+        call_id: str,
+        whole_call: bool = PROFILE_CALL,
+        every_n_turns: int = PROFILE_EVERY_N_TURNS,
+        sample_ms: float = PROFILE_SAMPLE_MS,
+    ):
+        self.output_dir = output_dir
+        self.call_id = call_id
+        self.whole_call = whole_call
+        self.every_n_turns = every_n_turns
+        self.sample_ms = sample_ms
+        self.enabled = whole_call or every_n_turns > 0
+
+        self._turn = None
+        self._sampler = None
+        self._snapshot = None
+        self._started_tracemalloc = False
+        self._t0 = 0.0
+
+        if self.enabled:
+            mode = "every turn" if whole_call else f"every {every_n_turns} turns"
+            print(f"[PROFILE] Enabled ({mode}, sample={sample_ms} ms)")
+
+    def start_turn(self, turn: int):
+        if not self.enabled:
+            return
+        self.end_turn()
+        if not (self.whole_call or turn % self.every_n_turns == 0):
+            return
+
+        self._turn = turn
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(10)
+        self._snapshot = tracemalloc.take_snapshot()
+
+        self._sampler = _StackSampler(self.sample_ms / 1000.0)
+        self._t0 = time.perf_counter()
+        self._sampler.start()
+
+    def end_turn(self):
+        if self._turn is None:
+            return
+
+        self._sampler.stop()
+        wall_ms = int((time.perf_counter() - self._t0) * 1000)
+
+        after = tracemalloc.take_snapshot()
+        mem_diff = after.compare_to(self._snapshot, "lineno")
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        try:
+            self._write(self._turn, wall_ms, self._sampler, mem_diff)
+        except Exception as e:
+            print(f"[PROFILE] ERROR writing turn {self._turn}: {e}")
+
+        self._turn = None
+        self._sampler = None
+        self._snapshot = None
+
+    # --------------------------------------------------
+
+    def _write(self, turn: int, wall_ms: int, sampler: _StackSampler, mem_diff):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stem = os.path.join(self.output_dir, f"conversation_{self.call_id}_turn{turn:03d}")
+
+        with open(stem + "_cpu.folded", "w", encoding="utf-8") as f:
+            for stack, count in sorted(sampler.stacks.items(), key=lambda kv: -kv[1]):
+                f.write(f"{stack} {count}\n")
+
+        # self = leaf frame, total = anywhere on the stack (per thread);
+        # samples blocked in an idle leaf only count towards idle_counts
+        self_counts, total_counts = {}, {}
+        idle_counts, thread_counts = {}, {}
+        for stack, count in sampler.stacks.items():
+            parts = stack.split(";")
+            thread, frames = parts[0], parts[1:]
+            if not frames:
+                continue
+            thread_counts[thread] = thread_counts.get(thread, 0) + count
+            if frames[-1].rsplit(":", 1)[-1] in IDLE_LEAF_FUNCTIONS:
+                idle_counts[thread] = idle_counts.get(thread, 0) + count
+                continue
+            leaf = (thread, frames[-1])
+            self_counts[leaf] = self_counts.get(leaf, 0) + count
+            for fn in set(frames):
+                key = (thread, fn)
+                total_counts[key] = total_counts.get(key, 0) + count
+
+        # real sample spacing stretches under GIL contention → scale by wall time
+        ms_per_sample = wall_ms / max(sampler.samples, 1)
+        lateness = sorted(sampler.lateness_ms)
+        lines = [
+            f"Turn {turn} – WALL-CLOCK profile (all threads, blocked ones included in the .folded file)",
+            f"wall {wall_ms} ms, {sampler.samples} samples every {self.sample_ms} ms",
+            "",
+            "Sampler wake-up lateness (GIL contention proxy): "
+            + (
+                f"avg={sum(lateness) / len(lateness):.1f} ms "
+                f"p95={lateness[min(int(len(lateness) * 0.95), len(lateness) - 1)]:.1f} ms "
+                f"max={lateness[-1]:.1f} ms"
+                if lateness else "n/a"
+            ),
+            "",
+            "== Busy vs idle samples per thread (idle = leaf in IDLE_LEAF_FUNCTIONS) ==",
+        ]
+        for thread, count in sorted(thread_counts.items(), key=lambda kv: -kv[1]):
+            idle = idle_counts.get(thread, 0)
+            lines.append(f"{count - idle:>6} busy {idle:>6} idle  [{thread}]")
+
+        for focus in FOCUS_THREADS:
+            lines += ["", f"== {focus}: top {THREAD_TOP_N} by self samples, idle waits excluded =="]
+            rows = [(fn, c) for (thread, fn), c in self_counts.items() if thread == focus]
+            for fn, count in sorted(rows, key=lambda kv: -kv[1])[:THREAD_TOP_N]:
+                lines.append(f"{count:>6}  {count * ms_per_sample:>8.0f} ms  {fn}")
+
+        lines += ["", f"== All threads: top {TOP_N} by self samples, idle waits excluded =="]
+        for (thread, fn), count in sorted(self_counts.items(), key=lambda kv: -kv[1])[:TOP_N]:
+            lines.append(f"{count:>6}  {count * ms_per_sample:>8.0f} ms  [{thread}] {fn}")
+
+        lines += ["", f"== All threads: top {TOP_N} by total samples, idle waits excluded =="]
+        for (thread, fn), count in sorted(total_counts.items(), key=lambda kv: -kv[1])[:TOP_N]:
+            lines.append(f"{count:>6}  {count * ms_per_sample:>8.0f} ms  [{thread}] {fn}")
+
+        lines += ["", f"== tracemalloc: top {TOP_N} allocation changes during the turn =="]
+        for stat in mem_diff[:TOP_N]:
+            lines.append(str(stat))
+
+        with open(stem + "_profile.txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        print(f"[PROFILE] Turn {turn} profile → {stem}_profile.txt")